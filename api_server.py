@@ -2,15 +2,119 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from managers.managers import Manager
 from managers.link import Link
+from managers.jobs import JobManager
+from managers.scheduler import RefreshScheduler
+import os
+import threading
 import warnings
 import pandas as pd
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for Flutter web/mobile
 
-# Initialize the manager and link with database path
-manager = Manager(db_path='stocks1112.db')
-link = Link(manager)
+# The manager and link are built on first use (see get_manager) so the
+# server starts serving immediately; heavy estimation/data libraries are
+# only imported when an estimation or fetch first needs them
+_manager = None
+_link = None
+_jobs = None
+_scheduler = None
+_init_lock = threading.Lock()
+
+# Background refresh cadence: RefreshScheduler kwargs, e.g. {"interval": 3600}
+# or daily {"times": ["16:30"], "weekdays_only": True} (server local time)
+REFRESH_SCHEDULE = {'times': ['16:30'], 'weekdays_only': True}
+# STOCK_SCHEDULER=0 disables scheduled refreshes. Otherwise the first serving
+# process to take the lock file runs them, however the app is served
+# (python api_server.py, flask run, gunicorn with several workers)
+SCHEDULER_ENABLED = os.environ.get('STOCK_SCHEDULER', '1').lower() not in ('0', 'false', 'no', '')
+SCHEDULER_LOCK_PATH = os.environ.get('STOCK_SCHEDULER_LOCK', 'refresh_scheduler.lock')
+_scheduler_lock = None
+
+
+def get_manager() -> Manager:
+    """Shared Manager, created on first request."""
+    global _manager, _link
+    if _manager is None:
+        with _init_lock:
+            if _manager is None:
+                _manager = Manager(db_path='stocks1112.db')
+                _link = Link(_manager)
+    return _manager
+
+
+def get_link() -> Link:
+    """Shared Link, created together with the Manager."""
+    get_manager()
+    return _link
+
+
+def get_jobs() -> JobManager:
+    """Background refresh jobs; one runs at a time and matching queued requests are merged."""
+    global _jobs
+    if _jobs is None:
+        with _init_lock:
+            if _jobs is None:
+                _jobs = JobManager(_run_refresh)
+    return _jobs
+
+
+def _run_refresh(progress, scheduled=False):
+    # Scheduled runs go stalest / most-held first and skip unchanged tickers
+    if scheduled:
+        get_link().refresh_stale(progress=progress)
+    else:
+        get_link().update_estimations(progress=progress)
+
+
+def get_scheduler() -> RefreshScheduler:
+    """Refresh scheduler; submits a scheduled job (merged with a queued one) at each run."""
+    global _scheduler
+    if _scheduler is None:
+        with _init_lock:
+            if _scheduler is None:
+                _scheduler = RefreshScheduler.from_config(
+                    lambda: get_jobs().submit(scheduled=True)[0].id,
+                    REFRESH_SCHEDULE
+                )
+    return _scheduler
+
+
+def start_scheduler() -> bool:
+    """
+    Start the refresh scheduler in this process if no other process runs it.
+    Ownership is an exclusive lock on SCHEDULER_LOCK_PATH held for the life
+    of the process, so when the owner exits another process takes over on
+    its next request. Returns whether this process runs the scheduler.
+    """
+    global _scheduler_lock
+    if not SCHEDULER_ENABLED:
+        return False
+    scheduler = get_scheduler()
+    if scheduler.running:
+        return True
+    with _init_lock:
+        try:
+            import fcntl
+        except ImportError:
+            # No flock (Windows): assume a single serving process
+            fcntl = None
+        if fcntl is not None:
+            if _scheduler_lock is None:
+                _scheduler_lock = open(SCHEDULER_LOCK_PATH, 'a')
+            try:
+                # Re-locking a lock this process already holds is a no-op
+                fcntl.flock(_scheduler_lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                return False
+        scheduler.start()
+    return True
+
+
+@app.before_request
+def _ensure_scheduler():
+    start_scheduler()
+
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings('ignore')
@@ -23,7 +127,7 @@ def get_estimations():
     Format: {ticker: {date: {predicted_price: x, yhat: y, ...}}}
     """
     try:
-        predictions = link.get_estimation()
+        predictions = get_link().get_estimation()
         
         # Convert DataFrame to nested dict format expected by Flutter
         result = {}
@@ -88,7 +192,7 @@ def add_user():
         if not name or not password:
             return jsonify({'error': 'Name and password are required'}), 400
         
-        link.add_user(name, password, email)
+        get_link().add_user(name, password, email)
         return jsonify({'message': 'User added successfully', 'name': name}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -107,7 +211,7 @@ def get_balance():
         if not name or not password:
             return jsonify({'error': 'Name and password are required'}), 400
         
-        balance = link.get_balance(name, password)
+        balance = get_link().get_balance(name, password)
         
         if balance is None:
             return jsonify({'error': 'User not found or invalid credentials'}), 404
@@ -129,7 +233,7 @@ def get_positions():
         if not name or not password:
             return jsonify({'error': 'Name and password are required'}), 400
         
-        positions = link.get_positions(name, password)
+        positions = get_link().get_positions(name, password)
         
         if positions is None:
             return jsonify({'error': 'User not found or invalid credentials'}), 404
@@ -152,9 +256,10 @@ def add_ticker():
         if not ticker:
             return jsonify({'error': 'Ticker is required'}), 400
         
-        result = link.add_ticker(ticker.upper())
+        result = get_link().add_ticker(ticker.upper())
         
         # Check if ticker was found
+        manager = get_manager()
         if result is None and ticker.upper() not in manager.data.tickers:
             return jsonify({'error': f'Ticker {ticker} not found'}), 404
         
@@ -166,21 +271,101 @@ def add_ticker():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/tickers/add', methods=['POST'])
+def add_tickers():
+    """
+    POST /tickers/add
+    Body: {"tickers": [str, ...]}
+    Validates known symbols from the local index and the rest in one remote batch
+    """
+    try:
+        data = request.get_json()
+        tickers = data.get('tickers')
+        
+        if not tickers or not isinstance(tickers, list):
+            return jsonify({'error': 'A list of tickers is required'}), 400
+        
+        result = get_link().add_tickers(tickers)
+        
+        return jsonify({
+            'message': f"{len(result['added'])} ticker(s) added",
+            'added': result['added'],
+            'invalid': result['invalid'],
+            'already_tracked': result['already_tracked'],
+            'using_database': get_manager().data.use_database
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/estimations/update', methods=['POST'])
 def update_estimations():
     """
     POST /estimations/update
-    Updates predictions for all tracked tickers
+    Starts a background refresh of all tracked tickers and returns 202 with
+    the job id right away; poll GET /jobs/<id> for progress.
+    A request made while a refresh is queued joins that job; one made while
+    a refresh is running queues a single follow-up job.
     Automatically uses database fallback if yfinance is rate limited
     """
     try:
-        link.update_estimations()
+        job, created = get_jobs().submit()
         
         return jsonify({
-            'message': 'Estimations updated successfully',
-            'using_database': manager.data.use_database,
-            'tickers_processed': len(manager.data.tickers)
+            'message': 'Refresh started' if created else 'Refresh already queued',
+            'job_id': job.id,
+            'status': job.status,
+            'status_url': f'/jobs/{job.id}'
+        }), 202
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    GET /jobs/<id>
+    Status of a refresh job with per-ticker progress and timings
+    """
+    try:
+        job = get_jobs().get(job_id)
+        
+        if job is None:
+            return jsonify({'error': f'Job {job_id} not found'}), 404
+        
+        result = job.to_dict()
+        if not job.active:
+            manager = get_manager()
+            result['using_database'] = manager.data.use_database
+            result['tickers_processed'] = len(manager.data.tickers)
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/estimations/intervals', methods=['POST'])
+def compute_intervals():
+    """
+    POST /estimations/intervals
+    Body: {"ticker": str}
+    Computes yhat_lower/yhat_upper for a ticker when long-term intervals
+    are deferred (interval_mode='lazy')
+    """
+    try:
+        data = request.get_json()
+        ticker = data.get('ticker')
+        
+        if not ticker:
+            return jsonify({'error': 'Ticker is required'}), 400
+        
+        intervals = get_link().get_intervals(ticker.upper())
+        
+        return jsonify({
+            'message': f'Intervals computed for {ticker.upper()}',
+            'rows': len(intervals)
         }), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -201,7 +386,7 @@ def buy_order():
         if not all([name, password, ticker, num_shares]):
             return jsonify({'error': 'All fields are required'}), 400
         
-        result = link.buy_order(name, password, ticker, float(num_shares))
+        result = get_link().buy_order(name, password, ticker, float(num_shares))
         
         if result is None:
             return jsonify({'error': 'User not found or invalid credentials'}), 404
@@ -229,7 +414,7 @@ def sell_order():
         if not all([name, password, ticker, num_shares]):
             return jsonify({'error': 'All fields are required'}), 400
         
-        result = link.sell_order(name, password, ticker, float(num_shares))
+        result = get_link().sell_order(name, password, ticker, float(num_shares))
         
         if result is None:
             return jsonify({'error': 'User not found or invalid credentials'}), 404
@@ -260,7 +445,7 @@ def update_user():
         if not email and not new_password:
             return jsonify({'error': 'Must provide email, new_password, or new_username to update'}), 400
         
-        link.update_user(name, password, email=email, new_password=new_password)
+        get_link().update_user(name, password, email=email, new_password=new_password)
         return jsonify({'message': 'User updated successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -280,7 +465,7 @@ def delete_user():
         if not name or not password:
             return jsonify({'error': 'Name and password are required'}), 400
         
-        link.delete_user(name, password)
+        get_link().delete_user(name, password)
         return jsonify({'message': 'User deleted successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -293,12 +478,18 @@ def get_status():
     Returns API status and data source information
     """
     try:
+        manager = get_manager()
         return jsonify({
             'status': 'online',
             'using_database': manager.data.use_database,
             'tracked_tickers': manager.data.tickers,
             'last_estimation': manager.last_estimation.isoformat() if manager.last_estimation else None,
-            'database_path': 'stocks1112.db'
+            'database_path': 'stocks1112.db',
+            'model_cache': manager.model_registry.stats(),
+            'metadata_cache': manager.data.metadata_cache.stats(),
+            'data_sources': manager.data.sources,
+            # running is False in processes that do not hold the scheduler lock
+            'scheduler': {**get_scheduler().status(), 'enabled': SCHEDULER_ENABLED}
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -318,7 +509,7 @@ def promote_to_owner():
         if not name or not password:
             return jsonify({'error': 'Name and password are required'}), 400
         
-        link.promote_to_owner(name, password)
+        get_link().promote_to_owner(name, password)
         return jsonify({'message': 'User promoted to owner successfully'}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -338,7 +529,7 @@ def list_users():
             return jsonify({'error': 'Name and password are required'}), 400
         
         # You'll need to add this method to link.py
-        users = link.get_all_users(name, password)
+        users = get_link().get_all_users(name, password)
         
         if users is None:
             return jsonify({'error': 'Unauthorized or invalid credentials'}), 403
@@ -352,7 +543,7 @@ def debug_users():
     """Debug endpoint to see all users"""
     try:
         users = {}
-        for username, user_obj in manager.user_manager.users.items():
+        for username, user_obj in get_manager().user_manager.users.items():
             users[username] = {
                 'type': type(user_obj).__name__,
                 'name': user_obj.name,
@@ -370,4 +561,9 @@ if __name__ == '__main__':
     print(f"Database: stocks1112.db")
     print(f"Using automatic fallback: yfinance → database")
     print("=" * 50)
-    app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
+    debug = True
+    # Start the schedule at boot rather than on the first request; with the
+    # debug reloader only the serving child process takes the scheduler lock
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_scheduler()
+    app.run(host='0.0.0.0', port=5001, debug=debug)
\ No newline at end of file
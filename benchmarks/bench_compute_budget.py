@@ -0,0 +1,54 @@
+"""
+Benchmark: throughput of per-ticker LightGBM fits at several compute budget
+splits (concurrent workers x threads per fit) of the same core count.
+
+Run from the repo root:
+    python -m benchmarks.bench_compute_budget
+"""
+import os
+import time
+
+import numpy as np
+
+from estimation.compute_budget import ComputeBudget
+from estimation.estimation import ShortEstimation
+
+
+def fit_one(seed: int, n_jobs: int, n_rows: int = 2_000) -> float:
+    rng = np.random.default_rng(seed)
+    changes = rng.normal(0.0, 1.0, n_rows)
+    X, y = ShortEstimation.build_windows(changes, 10)
+    est = ShortEstimation(params={"n_jobs": n_jobs, "verbose": -1})
+    est.train(X, y)
+    return float(est.model.booster_.predict(X[-1:])[0])
+
+
+def splits(total_cores: int):
+    """Every (workers, threads) split with workers * threads == total_cores, plus oversubscribed."""
+    out = [(w, total_cores // w) for w in range(1, total_cores + 1) if total_cores % w == 0]
+    if total_cores > 1:
+        out.append((total_cores, total_cores))  # oversubscribed: every worker uses every core
+    return out
+
+
+def main(n_fits: int = 32):
+    total_cores = os.cpu_count() or 1
+    print(f"{n_fits} fits on {total_cores} cores")
+    print(f"{'workers':>8} {'threads':>8} {'seconds':>8} {'fits/s':>8}")
+
+    for workers, threads in splits(total_cores):
+        # Size the budget to the split itself so the oversubscribed case is not clamped
+        budget = ComputeBudget(total_cores=workers * threads, workers=workers, threads_per_worker=threads)
+        start = time.perf_counter()
+        if workers == 1:
+            for seed in range(n_fits):
+                fit_one(seed, threads)
+        else:
+            with budget.executor() as pool:
+                list(pool.map(fit_one, range(n_fits), [threads] * n_fits))
+        elapsed = time.perf_counter() - start
+        print(f"{workers:>8} {threads:>8} {elapsed:>8.2f} {n_fits / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
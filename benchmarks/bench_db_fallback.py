@@ -0,0 +1,65 @@
+"""
+Benchmark: database fallback, one query per ticker vs one bulk query.
+
+The per-ticker path is what update_data's fallback used to do: one
+get_ticker_data() call per symbol, a MultiIndex per frame, pd.concat and
+swaplevel. The bulk path is DatabaseManager.get_tickers_data(), which loads
+every symbol in one query and pivots straight to (Ticker, Price).
+
+Run from the repo root:
+    python -m benchmarks.bench_db_fallback
+"""
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_ohlcv_store import build_sqlite, make_history
+from db_manager import DatabaseManager
+
+
+def per_ticker(db: DatabaseManager, tickers: list) -> pd.DataFrame:
+    all_data = {}
+    for ticker in tickers:
+        ticker_data = db.get_ticker_data(ticker, period='1y')
+        if not ticker_data.empty:
+            ticker_data.columns = pd.MultiIndex.from_product([ticker_data.columns, [ticker]])
+            all_data[ticker] = ticker_data
+    data = pd.concat(all_data.values(), axis=1)
+    data.columns = data.columns.swaplevel(0, 1)
+    return data
+
+
+def main(sizes=(10, 100, 500, 1000), n_rows: int = 252):
+    histories = {f"T{i:04d}": make_history(i, n_rows) for i in range(max(sizes))}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_sqlite(db_path, histories)
+        db = DatabaseManager(db_path)
+        db.connect()
+
+        print(f"{'tickers':>8} {'per-ticker s':>13} {'bulk s':>8} {'speedup':>8}")
+        for n in sizes:
+            tickers = list(histories)[:n]
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                old = per_ticker(db, tickers)
+                old_s = time.perf_counter() - start
+
+                start = time.perf_counter()
+                new = db.get_tickers_data(tickers, period='1y')
+                new_s = time.perf_counter() - start
+
+            same = np.allclose(old[new.columns].to_numpy(dtype=float), new.reindex(old.index).to_numpy(dtype=float),
+                               equal_nan=True)
+            print(f"{n:>8} {old_s:>13.3f} {new_s:>8.3f} {old_s / new_s:>7.1f}x  same={same}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: recursive vs direct multi-horizon ShortEstimation.
+
+Fits both strategies on synthetic AR(1) price-change series, holds out the
+last `horizon` bars of each series and reports price RMSE, directional hit
+rate, training time and forecast latency side by side.
+
+Run from the repo root:
+    python -m benchmarks.bench_direct_vs_recursive
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_squared_error
+
+from estimation.estimation import ShortEstimation
+
+
+def make_series(n_rows: int, phi: float, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    changes = np.empty(n_rows)
+    changes[0] = 0.0
+    noise = rng.normal(0.0, 1.0, n_rows)
+    for t in range(1, n_rows):
+        changes[t] = phi * changes[t - 1] + noise[t]
+    index = pd.bdate_range("2020-01-01", periods=n_rows)
+    return pd.DataFrame({"Close": 100.0 + np.cumsum(changes)}, index=index)
+
+
+def run(strategy: str, frames, horizon: int):
+    est = ShortEstimation(horizon=horizon, strategy=strategy, params={"verbose": -1})
+    errors, hits, train_t, forecast_t = [], [], 0.0, 0.0
+
+    for df in frames:
+        history, future = df.iloc[:-horizon], df["Close"].values[-horizon:]
+        X_train, y_train, last_close, last_window, _ = est.build_training_data(history)
+
+        start = time.perf_counter()
+        if strategy == "direct":
+            changes = est.preprocess_data(history)["Change"].values
+            est.train_direct(*est.build_direct_windows(changes, est.window_size, horizon))
+        else:
+            est.train(X_train, y_train)
+        train_t += time.perf_counter() - start
+
+        start = time.perf_counter()
+        if strategy == "direct":
+            pred_prices, _ = est.forecast_direct(last_close, last_window)
+        else:
+            pred_prices, _ = est.forecast(last_close, last_window)
+        forecast_t += time.perf_counter() - start
+
+        errors.append(np.sqrt(mean_squared_error(future, pred_prices)))
+        hits.append(np.sign(pred_prices[-1] - last_close) == np.sign(future[-1] - last_close))
+
+    n = len(frames)
+    return np.mean(errors), np.mean(hits), train_t / n, forecast_t / n
+
+
+def main(n_series: int = 20, n_rows: int = 500, horizon: int = 21):
+    frames = [make_series(n_rows, phi=0.3, seed=seed) for seed in range(n_series)]
+
+    print(f"{n_series} series x {n_rows} rows, horizon {horizon}")
+    print(f"{'strategy':>10} {'RMSE':>8} {'hit rate':>9} {'train (ms)':>11} {'forecast (ms)':>14}")
+    for strategy in ("recursive", "direct"):
+        rmse, hit_rate, train_t, forecast_t = run(strategy, frames, horizon)
+        print(f"{strategy:>10} {rmse:>8.3f} {hit_rate:>9.2f} {train_t * 1e3:>11.1f} {forecast_t * 1e3:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
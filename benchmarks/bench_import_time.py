@@ -0,0 +1,55 @@
+"""
+Benchmark: api_server startup cost.
+
+In a fresh interpreter, measures the time to import api_server, the time to
+answer the first /status and /estimations requests, and which heavy
+libraries got loaded along the way. Each measurement runs in its own
+subprocess so nothing is cached between runs.
+
+Run from the repo root:
+    python -m benchmarks.bench_import_time
+"""
+import json
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ("prophet", "lightgbm", "sklearn", "yfinance", "matplotlib")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import api_server
+imported = time.perf_counter()
+client = api_server.app.test_client()
+status = client.get('/status').status_code
+first_status = time.perf_counter()
+estimations = client.get('/estimations').status_code
+first_estimations = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - start,
+    'first_status_s': first_status - imported,
+    'first_estimations_s': first_estimations - first_status,
+    'status_codes': [status, estimations],
+    'loaded': [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def main(runs: int = 3):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=root, capture_output=True, text=True, check=True)
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    best = {key: min(r[key] for r in results) for key in ("import_s", "first_status_s", "first_estimations_s")}
+    print(f"import api_server:      {best['import_s'] * 1e3:8.1f} ms")
+    print(f"first GET /status:      {best['first_status_s'] * 1e3:8.1f} ms")
+    print(f"first GET /estimations: {best['first_estimations_s'] * 1e3:8.1f} ms")
+    print(f"status codes:           {results[-1]['status_codes']}")
+    print(f"heavy modules loaded:   {results[-1]['loaded'] or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
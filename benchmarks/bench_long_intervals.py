@@ -0,0 +1,50 @@
+"""
+Benchmark: LongEstimation prediction latency per interval mode.
+
+Fits Prophet once per ticker, then times predict() for each interval mode and
+reports how far its interval bounds are from the default 1000-path simulation.
+
+Run from the repo root:
+    python -m benchmarks.bench_long_intervals
+"""
+import logging
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from estimation.estimation import LongEstimation
+
+
+def make_frame(seed: int, n_rows: int = 252) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2024-01-01", periods=n_rows)
+    return pd.DataFrame({"Close": 100.0 + rng.normal(0.05, 1.0, n_rows).cumsum()}, index=index)
+
+
+def main(n_tickers: int = 5):
+    warnings.filterwarnings("ignore")
+    logging.getLogger("cmdstanpy").disabled = True
+    logging.getLogger("prophet").disabled = True
+
+    est = LongEstimation()
+    models = [est.fit_model(est.preprocess_data(make_frame(seed))) for seed in range(n_tickers)]
+    reference = [est.predict(model, "sampled") for model in models]
+
+    print(f"{n_tickers} tickers, horizon {est.horizon} days")
+    print(f"{'mode':>9} {'ms/ticker':>10} {'mean |bound - sampled|':>23}")
+    for mode in LongEstimation.INTERVAL_MODES:
+        start = time.perf_counter()
+        preds = [est.predict(model, mode) for model in models]
+        latency = (time.perf_counter() - start) / n_tickers
+
+        gaps = [
+            np.nanmean(np.abs(np.r_[p["yhat_lower"] - r["yhat_lower"], p["yhat_upper"] - r["yhat_upper"]]))
+            for p, r in zip(preds, reference)
+        ] if mode != "lazy" else [np.nan]
+        print(f"{mode:>9} {latency * 1e3:>10.2f} {np.mean(gaps):>23.3f}")
+
+
+if __name__ == "__main__":
+    main()
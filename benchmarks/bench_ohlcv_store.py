@@ -0,0 +1,93 @@
+"""
+Benchmark: reading one ticker's price history, SQLite vs the columnar OHLCVStore.
+
+Builds a throwaway SQLite database with the daily_prices / volume_data schema
+used by DatabaseManager and an OHLCVStore with the same bars, then times
+DatabaseManager.get_ticker_data() against OHLCVStore.read() (memory-mapped)
+and OHLCVStore.read(mmap=False).
+
+Run from the repo root:
+    python -m benchmarks.bench_ohlcv_store
+"""
+import contextlib
+import io
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from db_manager import DatabaseManager
+from managers.ohlcv_store import OHLCVStore
+
+
+def make_history(seed: int, n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=n_rows)
+    close = 100.0 + rng.normal(0.05, 1.0, n_rows).cumsum()
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.5, n_rows),
+        "High": close + 1.0,
+        "Low": close - 1.0,
+        "Close": close,
+        "Adj Close": close,
+        "Volume": rng.integers(1e5, 1e7, n_rows).astype(float),
+    }, index=index)
+
+
+def build_sqlite(path: str, histories: dict):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE daily_prices (symbol TEXT, date TEXT, open REAL, high REAL, low REAL, "
+                 "close REAL, adjusted_close REAL)")
+    conn.execute("CREATE TABLE volume_data (symbol TEXT, date TEXT, volume REAL)")
+    for ticker, df in histories.items():
+        dates = df.index.strftime("%Y-%m-%d")
+        conn.executemany("INSERT INTO daily_prices VALUES (?, ?, ?, ?, ?, ?, ?)", [
+            (ticker, d, *row) for d, row in zip(dates, df[["Open", "High", "Low", "Close", "Adj Close"]].itertuples(index=False))
+        ])
+        conn.executemany("INSERT INTO volume_data VALUES (?, ?, ?)",
+                         [(ticker, d, v) for d, v in zip(dates, df["Volume"])])
+    conn.execute("CREATE INDEX idx_prices ON daily_prices (symbol, date)")
+    conn.execute("CREATE INDEX idx_volume ON volume_data (symbol, date)")
+    conn.commit()
+    conn.close()
+
+
+def timed(read, tickers, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for ticker in tickers:
+            read(ticker)
+    return (time.perf_counter() - start) / (repeats * len(tickers))
+
+
+def main(n_tickers: int = 100, n_rows: int = 252, repeats: int = 3):
+    histories = {f"T{i:03d}": make_history(i, n_rows) for i in range(n_tickers)}
+    tickers = list(histories)
+    bytes_per_ticker = n_rows * 7 * 8
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_sqlite(db_path, histories)
+        store = OHLCVStore(os.path.join(tmp, "history"))
+        for ticker, df in histories.items():
+            store.write(ticker, df)
+
+        db = DatabaseManager(db_path)
+        db.connect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            sqlite_s = timed(lambda t: db.get_ticker_data(t, period="1y"), tickers, repeats)
+        db.close()
+        mmap_s = timed(store.read, tickers, repeats)
+        copy_s = timed(lambda t: store.read(t, mmap=False), tickers, repeats)
+
+    print(f"{n_tickers} tickers x {n_rows} rows")
+    print(f"{'path':>16} {'ms/ticker':>10} {'tickers/s':>10} {'MB/s':>8}")
+    for name, secs in (("sqlite", sqlite_s), ("store (mmap)", mmap_s), ("store (read)", copy_s)):
+        print(f"{name:>16} {secs * 1e3:>10.3f} {1 / secs:>10.0f} {bytes_per_ticker / secs / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: Manager.update_estimations, sequential vs pipelined parallel mode
+at 1..cpu_count workers.
+
+Price data is synthetic and injected in place of DataManager.update_data, so
+only data preparation and model fitting are timed. Each run uses a fresh
+model cache so every ticker is actually fitted.
+
+Run from the repo root:
+    python -m benchmarks.bench_parallel_estimations
+"""
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from managers.managers import Manager
+
+
+def make_data(n_tickers: int, n_rows: int = 260) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    index = pd.bdate_range("2024-01-01", periods=n_rows)
+    close = 100.0 + rng.normal(0.05, 1.0, (n_rows, n_tickers)).cumsum(axis=0)
+    return pd.concat(
+        {f"T{i:03d}": pd.DataFrame({"Close": close[:, i], "Volume": 1e6}, index=index) for i in range(n_tickers)},
+        axis=1, names=["Ticker", "Price"],
+    )
+
+
+def run(data: pd.DataFrame, **kwargs) -> float:
+    manager = Manager(db_path=os.path.join(tempfile.mkdtemp(), "none.db"), model_cache_dir=tempfile.mkdtemp(), **kwargs)
+    manager.data.tickers = list(data.columns.get_level_values(0).unique())
+
+    def update_data():
+        manager.data.data = data
+        manager.data.use_database = True  # no earnings lookups
+
+    manager.data.update_data = update_data
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        manager.update_estimations()
+    return time.perf_counter() - start
+
+
+def main(n_tickers: int = 16):
+    warnings.filterwarnings("ignore")
+    logging.getLogger("cmdstanpy").disabled = True
+    logging.getLogger("prophet").disabled = True
+
+    data = make_data(n_tickers)
+    total_cores = os.cpu_count() or 1
+    print(f"{n_tickers} tickers on {total_cores} cores")
+    print(f"{'mode':>12} {'workers':>8} {'seconds':>8} {'speedup':>8}")
+
+    baseline = run(data)
+    print(f"{'sequential':>12} {1:>8} {baseline:>8.2f} {1.0:>7.2f}x")
+    for workers in sorted({1, max(1, total_cores // 2), total_cores}):
+        budget = {"total_cores": total_cores, "workers": workers, "threads_per_worker": max(1, total_cores // workers)}
+        seconds = run(data, parallel_estimations=True, compute_budget=budget)
+        print(f"{'parallel':>12} {workers:>8} {seconds:>8.2f} {baseline / seconds:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark: per-ticker prediction upserts, PredictionStore vs the old MultiIndex frame.
+
+The old update_preds() dropped the ticker from one shared (Date, Ticker)
+DataFrame, merged, re-concatenated and re-sorted everything, so each refresh
+was quadratic in the number of tickers. The store only touches one ticker.
+
+Run from the repo root:
+    python -m benchmarks.bench_prediction_store
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from managers.prediction_store import PredictionStore
+
+
+def legacy_update(preds: pd.DataFrame, ticker: str, data: pd.DataFrame) -> pd.DataFrame:
+    # The pre-store DataManager.update_preds, kept here for comparison
+    df_temp = data.copy()
+    df_temp["Ticker"] = ticker
+    df_temp = df_temp.set_index("Ticker", append=True)
+    if ticker in preds.index.get_level_values("Ticker").unique():
+        existing = preds.xs(ticker, level="Ticker")
+        preds = preds.drop(ticker, level="Ticker")
+        merged = existing.combine_first(df_temp.droplevel("Ticker"))
+        merged["Ticker"] = ticker
+        preds = pd.concat([preds, merged.set_index("Ticker", append=True)])
+    else:
+        preds = pd.concat([preds, df_temp])
+    return preds.sort_index()
+
+
+def make_preds(seed: int):
+    rng = np.random.default_rng(seed)
+    short = pd.DataFrame(
+        {"predicted_price": rng.normal(100, 1, 21), "predicted_change": rng.normal(0, 1, 21)},
+        index=pd.bdate_range("2025-01-02", periods=21),
+    )
+    long = pd.DataFrame(
+        {"yhat": rng.normal(100, 1, 90), "yhat_lower": rng.normal(95, 1, 90), "yhat_upper": rng.normal(105, 1, 90)},
+        index=pd.date_range("2025-01-02", periods=90),
+    )
+    return short, long
+
+
+def main(sizes=(50, 200, 500)):
+    batches = [make_preds(seed) for seed in range(max(sizes))]
+    print(f"{'tickers':>8} {'legacy s':>9} {'store s':>8} {'speedup':>8}")
+    for n in sizes:
+        start = time.perf_counter()
+        preds = PredictionStore.empty_frame()
+        for i in range(n):
+            for data in batches[i]:
+                preds = legacy_update(preds, f"T{i}", data)
+        legacy = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store = PredictionStore()
+        for i in range(n):
+            for data in batches[i]:
+                store.upsert(f"T{i}", data)
+        store.frame()
+        columnar = time.perf_counter() - start
+
+        print(f"{n:>8} {legacy:>9.3f} {columnar:>8.3f} {legacy / columnar:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,22 @@ class DatabaseManager:
             self.conn.close()
             self.conn = None
     
+    @staticmethod
+    def _date_range(period: str):
+        """(start, end) datetimes for a period string ('1y', '6mo', '3mo', '1mo')."""
+        end_date = datetime.now()
+        if period == '1y':
+            start_date = end_date - timedelta(days=365)
+        elif period == '6mo':
+            start_date = end_date - timedelta(days=180)
+        elif period == '3mo':
+            start_date = end_date - timedelta(days=90)
+        elif period == '1mo':
+            start_date = end_date - timedelta(days=30)
+        else:
+            start_date = end_date - timedelta(days=365)
+        return start_date, end_date
+    
     def get_ticker_data(self, ticker: str, period='1y') -> pd.DataFrame:
         """
         Fetch historical price data for a ticker from database.
@@ -43,18 +59,7 @@ class DatabaseManager:
             if not self.connect():
                 return pd.DataFrame()
         
-        # Calculate date range based on period
-        end_date = datetime.now()
-        if period == '1y':
-            start_date = end_date - timedelta(days=365)
-        elif period == '6mo':
-            start_date = end_date - timedelta(days=180)
-        elif period == '3mo':
-            start_date = end_date - timedelta(days=90)
-        elif period == '1mo':
-            start_date = end_date - timedelta(days=30)
-        else:
-            start_date = end_date - timedelta(days=365)
+        start_date, end_date = self._date_range(period)
         
         # Query combining price and volume data
         query = """
@@ -106,6 +111,80 @@ class DatabaseManager:
             print(f"Error details: {e}")
             return pd.DataFrame()
     
+    # Above this many symbols the bulk query joins a temp table instead of binding an IN list
+    MAX_IN_PARAMS = 500
+    
+    def get_tickers_data(self, tickers: list, period='1y') -> pd.DataFrame:
+        """
+        Fetch historical price data for many tickers in a single query.
+        
+        Args:
+            tickers: Stock symbols
+            period: Time period (e.g., '1y', '6mo', '3mo')
+        
+        Returns:
+            Wide DataFrame with Date index and (Ticker, Price) columns, the same
+            layout update_data() builds; tickers without rows are left out
+        """
+        if not self.conn:
+            if not self.connect():
+                return pd.DataFrame()
+        
+        symbols = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        if not symbols:
+            return pd.DataFrame()
+        start_date, end_date = self._date_range(period)
+        
+        select = """
+        SELECT 
+            p.symbol,
+            p.date,
+            p.open,
+            p.high,
+            p.low,
+            p.close,
+            p.adjusted_close,
+            v.volume
+        FROM daily_prices p
+        LEFT JOIN volume_data v ON p.symbol = v.symbol AND p.date = v.date
+        """
+        dates = (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
+        
+        try:
+            if len(symbols) <= self.MAX_IN_PARAMS:
+                placeholders = ", ".join("?" * len(symbols))
+                query = select + f"WHERE p.symbol IN ({placeholders}) AND p.date >= ? AND p.date <= ?"
+                df = pd.read_sql_query(query, self.conn, params=(*symbols, *dates))
+            else:
+                self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS wanted_symbols (symbol TEXT PRIMARY KEY)")
+                self.conn.execute("DELETE FROM wanted_symbols")
+                self.conn.executemany("INSERT OR IGNORE INTO wanted_symbols VALUES (?)", [(s,) for s in symbols])
+                query = select + "JOIN wanted_symbols w ON w.symbol = p.symbol WHERE p.date >= ? AND p.date <= ?"
+                df = pd.read_sql_query(query, self.conn, params=dates)
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            warnings.warn(f"Bulk database query failed: {e}")
+            return pd.DataFrame()
+        
+        if df.empty:
+            warnings.warn(f"No data found in database for {len(symbols)} ticker(s)")
+            return pd.DataFrame()
+        
+        print(f"✓ Loaded {len(df)} rows from database for {df['symbol'].nunique()} ticker(s)")
+        
+        # Long rows -> one (Ticker, Price) block in a single pivot
+        fields = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume']
+        df.columns = ['symbol', 'date'] + fields
+        df['date'] = pd.to_datetime(df['date'])
+        df[fields] = df[fields].apply(pd.to_numeric, errors='coerce')
+        df = df.drop_duplicates(subset=['symbol', 'date'], keep='last')
+        
+        present = set(df['symbol'].unique())
+        found = [symbol for symbol in symbols if symbol in present]
+        wide = df.pivot(index='date', columns='symbol', values=fields)
+        wide = wide.swaplevel(0, 1, axis=1).reindex(columns=pd.MultiIndex.from_product([found, fields]))
+        wide.columns.names = ['Ticker', 'Price']
+        return wide
+    
     def get_volume_data(self, ticker: str, period='1y') -> pd.DataFrame:
         """Fetch volume data for a ticker."""
         if not self.conn:
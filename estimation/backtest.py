@@ -0,0 +1,323 @@
+import sqlite3
+import warnings
+from concurrent.futures import as_completed
+
+import numpy as np
+import pandas as pd
+
+from estimation.estimation import ShortEstimation, PooledShortEstimation, LongEstimation
+from estimation.compute_budget import ComputeBudget
+
+
+def forecast_metrics(actual: np.ndarray, predicted: np.ndarray, last_close: float) -> dict:
+    """
+    Error metrics for one forecast path.
+
+    rmse: root mean squared error of prices
+    mape: mean absolute percentage error of prices
+    hit_rate: share of steps where the predicted move from last_close has the
+              same sign as the real move
+    """
+    from sklearn.metrics import mean_squared_error
+
+    actual = np.asarray(actual, dtype=float)
+    predicted = np.asarray(predicted, dtype=float)
+
+    rmse = float(np.sqrt(mean_squared_error(actual, predicted)))
+    nonzero = actual != 0
+    mape = float(np.mean(np.abs((actual[nonzero] - predicted[nonzero]) / actual[nonzero]))) if nonzero.any() else np.nan
+    hit_rate = float(np.mean(np.sign(predicted - last_close) == np.sign(actual - last_close)))
+
+    return {'rmse': rmse, 'mape': mape, 'hit_rate': hit_rate}
+
+
+def short_samples(df: pd.DataFrame, est: ShortEstimation):
+    """
+    Preprocessed series and its sliding-window samples for backtesting.
+
+    Returns:
+      index, closes, changes, X_all, y_all (same samples as build_training_data),
+      target_pos (row position of each sample's target)
+    """
+    df = est.preprocess_data(df)
+    closes = df["Close"].values.astype(float)
+    changes = df["Change"].values.astype(float)
+    w = est.window_size
+
+    X_all, y_all = est.build_windows(changes, w)
+    nan = np.isnan(changes)
+    bad = np.lib.stride_tricks.sliding_window_view(nan[:-1], w).any(axis=1) | nan[w:]
+    target_pos = np.arange(w, len(changes))[~bad]
+    return df.index, closes, changes, X_all, y_all, target_pos
+
+
+def backtest_short(ticker: str, df: pd.DataFrame, est: ShortEstimation, origins) -> list:
+    """
+    Walk-forward folds for ShortEstimation on one ticker.
+
+    The sliding-window matrix is built once for the whole series; each fold
+    trains on the rows whose target lies before the fold origin, so no
+    feature matrix is rebuilt between folds. strategy="direct" trains on the
+    multi-horizon windows before the origin, as it does in production.
+    PooledShortEstimation is backtested across tickers by backtest_pooled_fold.
+    """
+    index, closes, changes, X_all, y_all, target_pos = short_samples(df, est)
+    w = est.window_size
+
+    rows = []
+    for fold, origin in enumerate(origins):
+        train_rows = target_pos < origin
+        last_window = changes[origin - w:origin]
+        if not train_rows.any() or np.isnan(last_window).any():
+            continue
+
+        if est.strategy == "direct":
+            # Every target of these windows lies before the origin
+            X_direct, y_direct = est.build_direct_windows(changes[:origin], w, est.horizon)
+            if len(X_direct) == 0:
+                continue
+            est.train_direct(X_direct, y_direct)
+            pred_prices, _ = est.forecast_direct(closes[origin - 1], last_window)
+        else:
+            est.train(X_all[train_rows], y_all[train_rows])
+            pred_prices, _ = est.forecast(closes[origin - 1], last_window)
+
+        actual = closes[origin:origin + est.horizon]
+        metrics = forecast_metrics(actual, pred_prices[:len(actual)], closes[origin - 1])
+        rows.append({
+            'ticker': ticker,
+            'model': 'short',
+            'fold': fold,
+            'origin': index[origin - 1],
+            'train_rows': int(train_rows.sum()),
+            **metrics,
+        })
+
+    return rows
+
+
+def backtest_pooled_fold(samples: dict, est: PooledShortEstimation, fold: int, origin_date,
+                         min_train: int) -> list:
+    """
+    One cross-sectional fold for PooledShortEstimation.
+
+    samples: {ticker: short_samples() output}
+    One pooled model is trained on the scaled samples of every ticker whose
+    target lies before `origin_date` (the first scored bar), as
+    estimate_batch() trains it in production; each ticker with at least
+    `min_train` rows of history is then forecast from its own last window.
+    """
+    w = est.window_size
+    X_parts, y_parts, series = [], [], []
+    for ticker, (index, closes, changes, X_all, y_all, target_pos) in samples.items():
+        origin = int(np.searchsorted(index, origin_date))
+        if origin < max(min_train, w + 1) or origin >= len(closes):
+            continue
+        train_rows = target_pos < origin
+        last_window = changes[origin - w:origin]
+        if not train_rows.any() or np.isnan(last_window).any():
+            continue
+
+        X_train, y_train, _, _ = est.scaled_training_data(X_all[train_rows], y_all[train_rows], closes[origin - 1])
+        X_parts.append(X_train)
+        y_parts.append(y_train)
+        series.append((ticker, origin, train_rows, last_window))
+
+    if not series:
+        return []
+
+    est.train(np.vstack(X_parts), np.concatenate(y_parts))
+    n_rows = sum(len(y) for y in y_parts)
+
+    rows = []
+    for ticker, origin, train_rows, last_window in series:
+        index, closes, _, _, y_all, _ = samples[ticker]
+        pred_prices, _ = est.forecast(closes[origin - 1], last_window, y_train=y_all[train_rows])
+
+        actual = closes[origin:origin + est.horizon]
+        metrics = forecast_metrics(actual, pred_prices[:len(actual)], closes[origin - 1])
+        rows.append({
+            'ticker': ticker,
+            'model': 'short',
+            'fold': fold,
+            'origin': index[origin - 1],
+            'train_rows': n_rows,
+            **metrics,
+        })
+
+    return rows
+
+
+def backtest_long(ticker: str, df: pd.DataFrame, est, origins, score_rows: int = 21) -> list:
+    """
+    Walk-forward folds for a long-horizon estimator (LongEstimation or any
+    estimator returning a yhat frame indexed by date) on one ticker.
+    Forecasts are scored on the trading days that actually followed the origin.
+    """
+    df = df.sort_index()
+    closes = df["Close"]
+
+    rows = []
+    for fold, origin in enumerate(origins):
+        history = df.iloc[:origin]
+        pred = est.estimate(history)
+
+        future = closes.iloc[origin:origin + score_rows]
+        future = future[future.index <= pred.index.max()]
+        matched = pred["yhat"].reindex(future.index).dropna()
+        if matched.empty:
+            continue
+
+        last_close = float(closes.iloc[origin - 1])
+        metrics = forecast_metrics(future.loc[matched.index].values, matched.values, last_close)
+        rows.append({
+            'ticker': ticker,
+            'model': 'long',
+            'fold': fold,
+            'origin': df.index[origin - 1],
+            'train_rows': int(origin),
+            **metrics,
+        })
+
+    return rows
+
+
+def _backtest_ticker(ticker, df, short_est, long_est, n_folds, step, min_train, long_score_rows):
+    """Process-pool worker: all folds of both estimators for one ticker."""
+    df = df.sort_index().dropna(subset=["Close"])
+    rows = []
+
+    if short_est is not None:
+        origins = fold_origins(len(df), short_est.horizon, n_folds, step, min_train)
+        rows.extend(backtest_short(ticker, df, short_est.for_ticker(ticker), origins))
+
+    if long_est is not None:
+        # Long forecasts are scored on the first `long_score_rows` trading days
+        # after the origin; a full 90-day horizon would leave few folds in a year
+        origins = fold_origins(len(df), long_score_rows, n_folds, step, min_train)
+        rows.extend(backtest_long(ticker, df, long_est, origins, long_score_rows))
+
+    return rows
+
+
+def fold_origins(n_rows: int, horizon: int, n_folds: int, step: int, min_train: int) -> list:
+    """
+    Rolling-origin fold positions: the last `n_folds` origins spaced `step`
+    rows apart, each leaving `horizon` rows to score and at least
+    `min_train` rows to train on. Origin o means rows [:o] are history.
+    """
+    last = n_rows - horizon
+    origins = [last - k * step for k in range(n_folds)]
+    return sorted(o for o in origins if o >= min_train)
+
+
+class WalkForwardBacktest:
+    """
+    Rolling-origin (walk-forward) backtest of ShortEstimation and
+    LongEstimation across tickers.
+
+    Tickers are spread over a process pool; each worker runs every fold of
+    its ticker and returns one metrics row per (model, fold). A pooled short
+    estimator is trained across tickers, so it is run per fold instead, with
+    fold origins taken from the longest series' dates.
+    """
+
+    def __init__(self, short_est: ShortEstimation = None, long_est=None, n_folds: int = 50,
+                 step: int = 1, min_train: int = 120, long_score_rows: int = 21, budget: ComputeBudget = None):
+        """
+        short_est / long_est: estimators to evaluate. Defaults to a
+                              ShortEstimation limited to the budget's thread
+                              share and a LongEstimation; pass False to skip one.
+        n_folds: number of rolling origins per ticker
+        step: rows between consecutive origins
+        min_train: minimum history rows before the first origin
+        long_score_rows: trading days after each origin used to score long forecasts
+        budget: ComputeBudget deciding pool size and threads per fit
+                (default: one single-threaded worker per core; 1 worker = run inline)
+        """
+        self.budget = budget or ComputeBudget()
+
+        if short_est is None:
+            # LightGBM gets only its thread share; the pool provides the parallelism
+            short_est = ShortEstimation(params={**self.budget.lgbm_params(), "verbose": -1})
+        if long_est is None:
+            long_est = LongEstimation()
+
+        self.short_est = short_est or None
+        self.long_est = long_est or None
+        self.n_folds = n_folds
+        self.step = step
+        self.min_train = min_train
+        self.long_score_rows = long_score_rows
+
+    def run(self, frames: dict) -> pd.DataFrame:
+        """
+        Backtest every ticker in `frames` ({ticker: DataFrame with a Close column}).
+
+        Returns:
+          results table with one row per (ticker, model, fold):
+          ticker, model, fold, origin, train_rows, rmse, mape, hit_rate
+        """
+        pooled = isinstance(self.short_est, PooledShortEstimation)
+        args = (None if pooled else self.short_est, self.long_est, self.n_folds, self.step,
+                self.min_train, self.long_score_rows)
+        # (label, worker, args) per unit of work
+        jobs = [(ticker, _backtest_ticker, (ticker, df) + args) for ticker, df in frames.items()]
+        if pooled:
+            jobs.extend(self._pooled_jobs(frames))
+        rows = []
+
+        if self.budget.workers == 1:
+            for label, worker, worker_args in jobs:
+                try:
+                    rows.extend(worker(*worker_args))
+                except Exception as e:
+                    warnings.warn(f"Backtest failed for {label}: {e}")
+        else:
+            with self.budget.executor() as pool:
+                futures = {
+                    pool.submit(worker, *worker_args): label
+                    for label, worker, worker_args in jobs
+                }
+                for future in as_completed(futures):
+                    try:
+                        rows.extend(future.result())
+                    except Exception as e:
+                        warnings.warn(f"Backtest failed for {futures[future]}: {e}")
+
+        columns = ['ticker', 'model', 'fold', 'origin', 'train_rows', 'rmse', 'mape', 'hit_rate']
+        results = pd.DataFrame(rows, columns=columns)
+        return results.sort_values(['ticker', 'model', 'fold']).reset_index(drop=True)
+
+    def _pooled_jobs(self, frames: dict) -> list:
+        """One backtest_pooled_fold job per fold, origins on the longest series' dates."""
+        est = self.short_est
+        samples = {}
+        for ticker, df in frames.items():
+            try:
+                samples[ticker] = short_samples(df.sort_index().dropna(subset=["Close"]), est)
+            except Exception as e:
+                warnings.warn(f"Backtest failed for {ticker}: {e}")
+        if not samples:
+            return []
+
+        dates = max((s[0] for s in samples.values()), key=len)
+        origins = fold_origins(len(dates), est.horizon, self.n_folds, self.step, self.min_train)
+        return [
+            (f"pooled fold {fold}", backtest_pooled_fold, (samples, est, fold, dates[origin], self.min_train))
+            for fold, origin in enumerate(origins)
+        ]
+
+    @staticmethod
+    def summary(results: pd.DataFrame) -> pd.DataFrame:
+        """Mean metrics per ticker and model."""
+        return results.groupby(['ticker', 'model'])[['rmse', 'mape', 'hit_rate']].mean()
+
+    @staticmethod
+    def save(results: pd.DataFrame, db_path: str, table: str = 'backtest_results'):
+        """Append a results table to a SQLite database."""
+        out = results.copy()
+        out['origin'] = out['origin'].astype(str)
+        out['run_at'] = pd.Timestamp.now().isoformat()
+        with sqlite3.connect(db_path) as conn:
+            out.to_sql(table, conn, if_exists='append', index=False)
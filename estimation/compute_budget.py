@@ -0,0 +1,127 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Environment variables read by BLAS/OpenMP runtimes when they start
+THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+    # Inherited by the CmdStan processes Prophet launches
+    "STAN_NUM_THREADS",
+)
+
+
+def limit_threads(threads: int):
+    """
+    Cap BLAS/OpenMP threads in the current process.
+
+    Environment variables only take effect for runtimes loaded afterwards
+    (e.g. in a fresh worker process); threadpoolctl, when installed, also
+    limits runtimes that are already loaded.
+    """
+    for var in THREAD_ENV_VARS:
+        os.environ[var] = str(threads)
+
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(threads)
+    except ImportError:
+        pass
+
+
+def _init_worker(threads: int):
+    limit_threads(threads)
+
+
+def pool_context():
+    """
+    Start method for worker pools. Workers are never forked from the
+    calling process, which may have other threads running (e.g. I/O
+    threads inside yfinance). A child forked then can inherit held locks
+    and hang or die. forkserver is used where available, otherwise spawn.
+    Both re-import the main module in each worker, so scripts that use a
+    pool must keep their top-level code under `if __name__ == '__main__':`.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+class ComputeBudget:
+    """
+    Splits the machine's cores between concurrent ticker workers and the
+    threads each estimator may use, so that per-ticker parallelism and
+    LightGBM/Stan/BLAS threading do not oversubscribe the box.
+
+    workers * threads_per_worker never exceeds total_cores.
+    """
+
+    def __init__(self, total_cores: int = None, workers: int = None, threads_per_worker: int = None):
+        """
+        total_cores: cores available (default os.cpu_count())
+        workers: tickers processed concurrently
+        threads_per_worker: threads per estimator fit (LightGBM n_jobs, and
+                            Stan/BLAS threads through THREAD_ENV_VARS)
+
+        With neither workers nor threads_per_worker set, every core runs its
+        own single-threaded worker, which gives the best throughput for many
+        small per-ticker fits.
+        """
+        self.total_cores = max(1, total_cores or os.cpu_count() or 1)
+
+        if workers is None and threads_per_worker is None:
+            workers, threads_per_worker = self.total_cores, 1
+        elif workers is None:
+            threads_per_worker = min(max(1, threads_per_worker), self.total_cores)
+            workers = self.total_cores // threads_per_worker
+        elif threads_per_worker is None:
+            workers = min(max(1, workers), self.total_cores)
+            threads_per_worker = self.total_cores // workers
+        else:
+            # Workers are kept over threads when both do not fit: at most one
+            # single-threaded worker per core
+            workers = min(max(1, workers), self.total_cores)
+            threads_per_worker = max(1, threads_per_worker)
+            if workers * threads_per_worker > self.total_cores:
+                threads_per_worker = self.total_cores // workers
+
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+
+    @classmethod
+    def from_config(cls, config: dict = None):
+        """
+        Build from a config dict ({"total_cores", "workers", "threads_per_worker"}),
+        with STOCK_TOTAL_CORES / STOCK_WORKERS / STOCK_THREADS_PER_WORKER
+        environment variables as fallbacks.
+        """
+        config = config or {}
+
+        def pick(key, env):
+            value = config.get(key, os.environ.get(env))
+            return int(value) if value not in (None, "") else None
+
+        return cls(
+            total_cores=pick("total_cores", "STOCK_TOTAL_CORES"),
+            workers=pick("workers", "STOCK_WORKERS"),
+            threads_per_worker=pick("threads_per_worker", "STOCK_THREADS_PER_WORKER"),
+        )
+
+    def lgbm_params(self) -> dict:
+        """LightGBM params limiting each booster to its thread share."""
+        return {"n_jobs": self.threads_per_worker}
+
+    def executor(self) -> ProcessPoolExecutor:
+        """Process pool with `workers` processes, each capped to its thread share (see pool_context)."""
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=pool_context(),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker,),
+        )
+
+    def __repr__(self):
+        return (f"ComputeBudget(total_cores={self.total_cores}, workers={self.workers}, "
+                f"threads_per_worker={self.threads_per_worker})")
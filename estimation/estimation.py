@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
+import copy
+import hashlib
+import json
+import os
+import warnings
+from concurrent.futures import as_completed
+from statistics import NormalDist
+from typing import TYPE_CHECKING
 from pandas import DataFrame
-import lightgbm as lgb
 import pandas as pd
-from sklearn.metrics import mean_squared_error
 import numpy as np
-from prophet import Prophet
+
+# lightgbm, sklearn and prophet are slow to import; they are imported where
+# first used so that importing this module (e.g. at API startup) stays cheap
+if TYPE_CHECKING:
+    from prophet import Prophet
 
 class Estimation(ABC):
     @abstractmethod
@@ -27,12 +37,90 @@ class ShortEstimation(Estimation):
     - Uses past price changes in a sliding window to predict next-day change.
     - Trains on ALL available historical samples (no train/test split).
     - Forecasts `horizon` steps beyond the last date in the dataframe.
+    - strategy="direct" predicts every step ahead at once instead of rolling forward.
     """
 
-    def __init__(self, horizon: int = 21, window_size: int = 10):
+    # LightGBM hyperparameters used by train()
+    DEFAULT_PARAMS = {
+        "n_estimators": 500,
+        "learning_rate": 0.05,
+        "num_leaves": 31,
+        "subsample": 0.9,
+        "colsample_bytree": 0.9,
+        "max_depth": -1,
+        "reg_alpha": 0.0,
+        "reg_lambda": 0.0,
+        "min_child_samples": 20,
+    }
+
+    # fit_state entries kept when no registry sets the limit
+    DEFAULT_MAX_FIT_STATES = 128
+
+    def __init__(self, horizon: int = 21, window_size: int = 10, fast_rollout: bool = True,
+                 params: dict = None, registry=None, incremental: bool = False,
+                 incremental_trees: int = 25, incremental_min_samples: int = 60,
+                 full_retrain_every: int = 20, drift_threshold: float = 2.0,
+                 strategy: str = "recursive", ticker_configs: dict = None):
+        """
+        horizon: number of future steps to forecast
+        window_size: number of past changes used as features
+        strategy: "recursive" (one-step model rolled forward, feeding back its
+                  own predictions) or "direct" (one model with the step ahead as
+                  a feature, all `horizon` changes from one batched predict)
+        fast_rollout: roll forward on raw NumPy through the booster instead of
+                      building a one-row DataFrame per step (same output)
+        params: LightGBM hyperparameters overriding DEFAULT_PARAMS
+        registry: optional ModelRegistry; when set, train() reuses a cached
+                  model whenever the training window and settings are unchanged
+        incremental: when a ticker's window only gained a few new bars, continue
+                     boosting the previous model instead of refitting all trees
+        incremental_trees: trees added per incremental update
+        incremental_min_samples: minimum number of most recent samples boosted
+                                 on (a handful of new bars is too few for a split)
+        full_retrain_every: force a full retrain after this many incremental updates
+        drift_threshold: force a full retrain when the previous model's RMSE on
+                         the new samples exceeds this many target std devs
+        ticker_configs: {ticker: {"window_size", "params"}} tuned per ticker
+                        (see tuning.search_per_ticker); these tickers train
+                        and forecast with their own settings (see for_ticker)
+        """
+        if strategy not in ("recursive", "direct"):
+            raise ValueError(f"Unknown strategy {strategy!r}, expected 'recursive' or 'direct'")
+
         self.horizon = horizon
         self.window_size = window_size
+        self.strategy = strategy
+        self.fast_rollout = fast_rollout
+        self.params = {**self.DEFAULT_PARAMS, **(params or {})}
+        self.registry = registry
+        self.incremental = incremental
+        self.incremental_trees = incremental_trees
+        self.incremental_min_samples = incremental_min_samples
+        self.full_retrain_every = full_retrain_every
+        self.drift_threshold = drift_threshold
+        self.ticker_configs = ticker_configs or {}
         self.model = None
+        self.direct_model = None
+
+        # ticker -> state of the last fit, used by incremental training
+        self.fit_state = {}
+
+    def for_ticker(self, ticker: str = None) -> "ShortEstimation":
+        """
+        The estimator to use for `ticker`: self, or a shallow copy with the
+        ticker's tuned window_size and params when ticker_configs has an
+        entry. The copy shares the registry and incremental fit state.
+        """
+        config = self.ticker_configs.get(ticker)
+        if config is None:
+            return self
+        est = copy.copy(self)
+        est.ticker_configs = {}
+        est.window_size = int(config.get("window_size", self.window_size))
+        est.params = {**self.params, **config.get("params", {})}
+        est.model = None
+        est.direct_model = None
+        return est
 
     # Preprocess
     def preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -45,6 +133,87 @@ class ShortEstimation(Estimation):
         df["Change"] = df["Close"].diff()
         return df
 
+    # Sliding windows (vectorized)
+    @staticmethod
+    def build_windows(changes: np.ndarray, window_size: int):
+        """
+        Build (X, y) sliding-window samples without any per-row Python work.
+
+        Row i of X holds changes[i : i + window_size] and y[i] holds
+        changes[i + window_size]. Samples whose window or target contains a
+        NaN are dropped, so the result is identical to build_windows_loop().
+        """
+        changes = np.asarray(changes)
+        if len(changes) <= window_size:
+            return np.empty((0, window_size), dtype=changes.dtype), np.empty(0, dtype=changes.dtype)
+
+        windows = np.lib.stride_tricks.sliding_window_view(changes[:-1], window_size)
+        targets = changes[window_size:]
+
+        # One NaN mask for the whole matrix instead of one check per window
+        nan = np.isnan(changes)
+        bad = np.lib.stride_tricks.sliding_window_view(nan[:-1], window_size).any(axis=1)
+        keep = ~(bad | nan[window_size:])
+
+        # Boolean indexing copies, so X does not alias `changes`
+        return windows[keep], targets[keep]
+
+    @staticmethod
+    def build_windows_loop(changes: np.ndarray, window_size: int):
+        """
+        Reference (per-row loop) version of build_windows(). Kept for
+        benchmarking and for checking the vectorized builder.
+        """
+        X_list = []
+        y_list = []
+
+        # Build training samples: predict change[t] from previous `window_size` changes.
+        for t in range(window_size, len(changes)):
+            window = changes[t - window_size: t]  # shape (window_size,)
+            target = changes[t]  # change at time t
+
+            # Skip if any NaNs in window/target
+            if np.any(np.isnan(window)) or np.isnan(target):
+                continue
+
+            X_list.append(window)
+            y_list.append(target)
+
+        return np.array(X_list), np.array(y_list)
+
+    # Direct multi-horizon windows (vectorized)
+    @staticmethod
+    def build_direct_windows(changes: np.ndarray, window_size: int, horizon: int):
+        """
+        Build stacked training samples for the direct strategy.
+
+        For every window changes[i : i + window_size] there is one row per step
+        ahead h = 1..horizon: the window followed by h, with target
+        changes[i + window_size + h - 1]. Samples with a NaN anywhere in the
+        window or in the horizon targets are dropped.
+
+        Returns:
+          X of shape (n_windows * horizon, window_size + 1), y of shape (n_windows * horizon,)
+        """
+        changes = np.asarray(changes, dtype=float)
+        N = len(changes)
+        if N < window_size + horizon:
+            return np.empty((0, window_size + 1)), np.empty(0)
+
+        windows = np.lib.stride_tricks.sliding_window_view(changes[:N - horizon], window_size)
+        targets = np.lib.stride_tricks.sliding_window_view(changes[window_size:], horizon)
+
+        nan = np.isnan(changes)
+        bad = (np.lib.stride_tricks.sliding_window_view(nan[:N - horizon], window_size).any(axis=1)
+               | np.lib.stride_tricks.sliding_window_view(nan[window_size:], horizon).any(axis=1))
+        windows, targets = windows[~bad], targets[~bad]
+
+        n_windows = len(windows)
+        X = np.empty((n_windows * horizon, window_size + 1), dtype=float)
+        X[:, :window_size] = np.repeat(windows, horizon, axis=0)
+        X[:, window_size] = np.tile(np.arange(1, horizon + 1), n_windows)
+        return X, targets.reshape(-1)
+
     # Build training data (ALL data)
     def build_training_data(self, df: pd.DataFrame):
         """
@@ -66,27 +235,11 @@ class ShortEstimation(Estimation):
                 f"Not enough data: need > {self.window_size + 1} rows, have {N}"
             )
 
-        X_list = []
-        y_list = []
-
-        # Build training samples: predict change[t] from previous `window_size` changes.
-        for t in range(self.window_size, N):
-            window = changes[t - self.window_size: t]  # shape (window_size,)
-            target = changes[t]  # change at time t
-
-            # Skip if any NaNs in window/target
-            if np.any(np.isnan(window)) or np.isnan(target):
-                continue
+        X_train, y_train = self.build_windows(changes, self.window_size)
 
-            X_list.append(window)
-            y_list.append(target)
-
-        if not X_list:
+        if len(X_train) == 0:
             raise ValueError("No valid training samples (too many NaNs or too little data).")
 
-        X_train = np.array(X_list)  # (num_samples, window_size)
-        y_train = np.array(y_list)  # (num_samples,)
-
         # Last known close is the most recent close in df
         last_close = float(closes[-1])
 
@@ -111,24 +264,149 @@ class ShortEstimation(Estimation):
         return X_train, y_train, last_close, last_window, forecast_index
 
     # Train model
-    def train(self, X_train: np.ndarray, y_train: np.ndarray):
+    def train(self, X_train: np.ndarray, y_train: np.ndarray, ticker: str = None):
         """
         Train a LightGBM regressor on (X_train, y_train).
+
+        If a registry is attached, a model previously trained on the same
+        window with the same settings is reused instead of retraining.
+        In incremental mode the ticker's previous model is warm-started on
+        the new samples when possible (see _train_incremental).
         """
-        model = lgb.LGBMRegressor(
-            n_estimators=500,
-            learning_rate=0.05,
-            num_leaves=31,
-            subsample=0.9,
-            colsample_bytree=0.9,
-            max_depth=-1,
-            reg_alpha=0.0,
-            reg_lambda=0.0,
-            min_child_samples=20,
-        )
-        model.fit(X_train, y_train)
+        key = None
+        if self.registry is not None:
+            key = self.registry.make_key(ticker, self.params, self.window_size, X_train, y_train)
+            cached = self.registry.get(key)
+            if cached is not None:
+                self.model = cached
+                if ticker not in self.fit_state or self.fit_state[ticker]["model"] is not cached:
+                    # Keep the cached model's warm-start count; a model saved
+                    # without one has unknown lineage and gets a full retrain next
+                    updates = getattr(cached, "incremental_updates_", self.full_retrain_every)
+                    self._record_fit(ticker, cached, X_train, y_train, updates=updates)
+                return
+
+        import lightgbm as lgb
+
+        model = None
+        if self.incremental and ticker is not None:
+            model = self._train_incremental(X_train, y_train, ticker)
+
+        if model is None:
+            model = lgb.LGBMRegressor(**self.params)
+            model.fit(X_train, y_train)
+            self._record_fit(ticker, model, X_train, y_train, updates=0)
+
         self.model = model
 
+        if key is not None:
+            self.registry.put(key, model)
+
+    def _record_fit(self, ticker, model, X_train, y_train, updates: int):
+        # Kept on the model too, so the count is pickled with it by the registry
+        model.incremental_updates_ = updates
+        # Only incremental training reads the state; holding a booster and
+        # window per ticker otherwise just grows memory with the universe
+        if ticker is None or not self.incremental:
+            return
+        self.keep_fit_state(ticker, {
+            "model": model,
+            "last_x": X_train[-1].copy(),
+            "last_y": float(y_train[-1]),
+            "target_std": float(np.std(y_train)),
+            "updates": updates,
+        })
+
+    def keep_fit_state(self, ticker, state: dict):
+        """
+        Store a ticker's fit state, evicting the least recently fitted tickers
+        beyond the registry's max_models (DEFAULT_MAX_FIT_STATES without one).
+        """
+        limit = self.registry.max_models if self.registry is not None else self.DEFAULT_MAX_FIT_STATES
+        # dicts keep insertion order: re-inserting moves the ticker to the end
+        self.fit_state.pop(ticker, None)
+        self.fit_state[ticker] = state
+        while len(self.fit_state) > limit:
+            del self.fit_state[next(iter(self.fit_state))]
+
+    def _train_incremental(self, X_train: np.ndarray, y_train: np.ndarray, ticker: str):
+        """
+        Continue boosting the ticker's previous model on the samples added
+        since it was trained. Returns None when a full retrain is needed:
+        no previous fit, history rewritten, retrain schedule reached or drift.
+        """
+        state = self.fit_state.get(ticker)
+        if state is None or state["updates"] >= self.full_retrain_every:
+            return None
+
+        # Find the previous last sample in the new window; everything after it is new.
+        # The window rolls (oldest bars drop off), so match on content, not position.
+        matches = np.flatnonzero((X_train == state["last_x"]).all(axis=1) & (y_train == state["last_y"]))
+        if len(matches) == 0:
+            return None
+
+        n_new = len(X_train) - (matches[-1] + 1)
+        if n_new == 0:
+            return state["model"]
+
+        import lightgbm as lgb
+        from sklearn.metrics import mean_squared_error
+
+        # Drift check: previous model's error on the unseen samples vs. the target spread
+        prev_model = state["model"]
+        X_new, y_new = X_train[-n_new:], y_train[-n_new:]
+        rmse = np.sqrt(mean_squared_error(y_new, prev_model.booster_.predict(X_new)))
+        if state["target_std"] > 0 and rmse > self.drift_threshold * state["target_std"]:
+            return None
+
+        tail = max(n_new, self.incremental_min_samples)
+        model = lgb.LGBMRegressor(**{**self.params, "n_estimators": self.incremental_trees})
+        model.fit(X_train[-tail:], y_train[-tail:], init_model=prev_model.booster_)
+
+        self._record_fit(ticker, model, X_train, y_train, updates=state["updates"] + 1)
+        return model
+
+    def train_direct(self, X_train: np.ndarray, y_train: np.ndarray, ticker: str = None):
+        """
+        Train the direct multi-horizon model on build_direct_windows() output.
+        Uses the registry the same way train() does.
+        """
+        key = None
+        if self.registry is not None:
+            key = self.registry.make_key(f"{ticker}:direct", {**self.params, "horizon": self.horizon},
+                                         self.window_size, X_train, y_train)
+            cached = self.registry.get(key)
+            if cached is not None:
+                self.direct_model = cached
+                return
+
+        import lightgbm as lgb
+
+        model = lgb.LGBMRegressor(**self.params)
+        model.fit(X_train, y_train)
+        self.direct_model = model
+
+        if key is not None:
+            self.registry.put(key, model)
+
+    # Direct forecast
+    def forecast_direct(self, last_close: float, last_window: np.ndarray):
+        """
+        Predict all `self.horizon` changes with one batched predict call:
+        one row per step ahead, each holding the last window and the step.
+        """
+        if self.direct_model is None:
+            raise RuntimeError("Direct model is not trained. Call train_direct() first.")
+
+        w = self.window_size
+        X = np.empty((self.horizon, w + 1), dtype=float)
+        X[:, :w] = last_window
+        X[:, w] = np.arange(1, self.horizon + 1)
+
+        pred_changes = self.direct_model.booster_.predict(X)
+        pred_prices = float(last_close) + np.cumsum(pred_changes)
+        return pred_prices, pred_changes
+
     # Autoregressive forecast
     def forecast(self, last_close: float, last_window: np.ndarray):
         """
@@ -141,6 +419,9 @@ class ShortEstimation(Estimation):
         if self.model is None:
             raise RuntimeError("Model is not trained. Call train() first.")
 
+        if self.fast_rollout:
+            return self._forecast_fast(last_close, last_window)
+
         window_buf = last_window.astype(float).copy()
         preds_changes = []
         preds_prices = []
@@ -164,20 +445,198 @@ class ShortEstimation(Estimation):
 
         return np.array(preds_prices), np.array(preds_changes)
 
-    def estimate(self, df: pd.DataFrame):
+    def _forecast_fast(self, last_close: float, last_window: np.ndarray):
+        """
+        Fast version of forecast() with no per-step DataFrame or np.roll.
+
+        The window lives in a buffer of length window_size + horizon that is
+        allocated once; step i reads the contiguous view buf[i : i + window_size]
+        and writes its prediction right after it, so nothing is rolled or
+        copied. The raw booster is called with a 2-D NumPy view, which skips
+        the sklearn/pandas validation done by LGBMRegressor.predict().
+        """
+        booster = self.model.booster_
+        w = self.window_size
+
+        buf = np.empty(w + self.horizon, dtype=float)
+        buf[:w] = last_window
+        preds_prices = np.empty(self.horizon, dtype=float)
+
+        current_close = float(last_close)
+        for i in range(self.horizon):
+            pred_change = float(booster.predict(buf[i:i + w].reshape(1, w))[0])
+            buf[w + i] = pred_change
+
+            # Update price
+            current_close = current_close + pred_change
+            preds_prices[i] = current_close
+
+        return preds_prices, buf[w:].copy()
+
+    # Lock-step batched forecast
+    def forecast_batch(self, last_closes: np.ndarray, last_windows: np.ndarray, models=None,
+                       static_features: np.ndarray = None, scales: np.ndarray = None):
+        """
+        Roll many series forward together, one predict call per step.
+
+        last_closes: array of shape (n_series,) with the last close of each series.
+        last_windows: array of shape (n_series, window_size) with the most recent
+                      changes of each series.
+        models: optional sequence of n_series trained regressors, one per row.
+                Rows sharing the same model are predicted in a single call.
+                Defaults to self.model for every row.
+        static_features: optional (n_series, k) features appended to every
+                         step's window (constant over the rollout).
+        scales: optional (n_series,) factors; when given, windows and model
+                outputs are in scaled units and are multiplied back by the
+                scale before updating prices.
+
+        Returns:
+          pred_prices, pred_changes (both of shape (n_series, horizon))
+        """
+        last_closes = np.asarray(last_closes, dtype=float)
+        last_windows = np.asarray(last_windows, dtype=float).reshape(len(last_closes), self.window_size)
+        n = len(last_closes)
+        w = self.window_size
+
+        if models is None:
+            if self.model is None:
+                raise RuntimeError("Model is not trained. Call train() first.")
+            models = [self.model] * n
+
+        # Group rows by model so each distinct booster is called once per step
+        groups = {}
+        for row, model in enumerate(models):
+            groups.setdefault(id(model), (model.booster_, []))[1].append(row)
+        groups = [
+            (booster, slice(None) if len(rows) == n else np.array(rows))
+            for booster, rows in groups.values()
+        ]
+
+        buf = np.empty((n, w + self.horizon), dtype=float)
+        buf[:, :w] = last_windows
+        preds_prices = np.empty((n, self.horizon), dtype=float)
+
+        # Static features are written once; only the window part changes per step
+        X_full = None
+        if static_features is not None:
+            static_features = np.asarray(static_features, dtype=float).reshape(n, -1)
+            X_full = np.empty((n, w + static_features.shape[1]), dtype=float)
+            X_full[:, w:] = static_features
+
+        current_close = last_closes.copy()
+        for i in range(self.horizon):
+            if X_full is None:
+                X_step = buf[:, i:i + w]
+            else:
+                X_full[:, :w] = buf[:, i:i + w]
+                X_step = X_full
+            for booster, rows in groups:
+                buf[rows, w + i] = booster.predict(X_step[rows])
+
+            # Update prices
+            if scales is None:
+                current_close += buf[:, w + i]
+            else:
+                current_close += buf[:, w + i] * scales
+            preds_prices[:, i] = current_close
+
+        if scales is None:
+            return preds_prices, buf[:, w:].copy()
+        return preds_prices, buf[:, w:] * np.asarray(scales, dtype=float)[:, None]
+
+    def estimate_batch(self, frames: dict):
+        """
+        Run estimate() for many tickers, rolling all forecasts in lock-step.
+
+        frames: {ticker: DataFrame} as accepted by estimate().
+
+        Each ticker still gets its own model; the rollout then advances every
+        ticker's window together through forecast_batch().
+
+        Returns:
+          predictions ({ticker: DataFrame like estimate()}),
+          errors ({ticker: Exception} for tickers that could not be trained)
+        """
+        predictions = {}
+        errors = {}
+
+        # Direct forecasts are already one predict call per ticker
+        if self.strategy == "direct":
+            for ticker, df in frames.items():
+                try:
+                    predictions[ticker], _ = self.estimate(df, ticker=ticker)
+                except Exception as e:
+                    errors[ticker] = e
+            return predictions, errors
+
+        # Tickers with tuned configs may use another window size; each window
+        # size is rolled out as its own batch
+        groups = {}
+        for ticker, df in frames.items():
+            est = self.for_ticker(ticker)
+            try:
+                X_train, y_train, last_close, last_window, forecast_index = est.build_training_data(df)
+                est.train(X_train, y_train, ticker=ticker)
+            except Exception as e:
+                errors[ticker] = e
+                continue
+
+            group = groups.setdefault(est.window_size, {
+                "est": est, "tickers": [], "closes": [], "windows": [], "indexes": [], "models": [],
+            })
+            group["tickers"].append(ticker)
+            group["closes"].append(last_close)
+            group["windows"].append(last_window)
+            group["indexes"].append(forecast_index)
+            group["models"].append(est.model)
+            self.model = est.model
+
+        for group in groups.values():
+            pred_prices, pred_changes = group["est"].forecast_batch(
+                np.array(group["closes"]), np.vstack(group["windows"]), group["models"])
+
+            for k, ticker in enumerate(group["tickers"]):
+                predictions[ticker] = pd.DataFrame(
+                    {
+                        "predicted_price": pred_prices[k],
+                        "predicted_change": pred_changes[k],
+                    },
+                    index=group["indexes"][k],
+                )
+
+        return predictions, errors
+
+    def estimate(self, df: pd.DataFrame, ticker: str = None):
         """
         Full pipeline (real-world mode):
           - Train on ALL available data
           - Forecast `horizon` future prices beyond the dataset
 
+        ticker: optional symbol, used to key the model registry
+
         Returns:
           predicted_price_series, (None for real_price_series in real-world mode)
         """
+        est = self.for_ticker(ticker)
+        if est is not self:
+            result = est.estimate(df, ticker=ticker)
+            self.model, self.direct_model = est.model, est.direct_model
+            return result
+
         X_train, y_train, last_close, last_window, forecast_index = self.build_training_data(df)
 
-        self.train(X_train, y_train)
+        if self.strategy == "direct":
+            changes = self.preprocess_data(df)["Change"].values
+            X_direct, y_direct = self.build_direct_windows(changes, self.window_size, self.horizon)
+            if len(X_direct) == 0:
+                raise ValueError("No valid direct training samples (too many NaNs or too little data).")
 
-        pred_prices, pred_changes = self.forecast(last_close, last_window)
+            self.train_direct(X_direct, y_direct, ticker=ticker)
+            pred_prices, pred_changes = self.forecast_direct(last_close, last_window)
+        else:
+            self.train(X_train, y_train, ticker=ticker)
+            pred_prices, pred_changes = self.forecast(last_close, last_window)
 
         out = pd.DataFrame(
             {
@@ -191,16 +650,197 @@ class ShortEstimation(Estimation):
         return out, None
 
 
+class PooledShortEstimation(ShortEstimation):
+    """
+    Cross-sectional variant of ShortEstimation: one global LightGBM model
+    trained on the stacked windows of every ticker.
+
+    Windows and targets are divided by each ticker's volatility (std of daily
+    changes) so tickers with different price levels share one scale, and
+    two ticker-level features are appended to every window:
+      - log of the last close (price scale)
+      - volatility / last close (normalized volatility)
+
+    Training cost grows with the total number of rows instead of the number
+    of tickers, and the rollout is exactly one predict call per step.
+    """
+
+    POOLED_KEY = "__pooled__"
+
+    def __init__(self, horizon: int = 21, window_size: int = 10, params: dict = None, registry=None):
+        # Incremental warm-start matches samples per ticker, which does not
+        # apply to the stacked matrix
+        super().__init__(horizon=horizon, window_size=window_size, params=params,
+                         registry=registry, incremental=False)
+
+    @staticmethod
+    def ticker_features(last_close: float, y_train: np.ndarray):
+        """
+        Returns:
+          scale (volatility used to normalize changes), static feature vector
+        """
+        scale = float(np.std(y_train))
+        if not np.isfinite(scale) or scale <= 0:
+            scale = 1.0
+        price = max(abs(last_close), 1e-8)
+        return scale, np.array([np.log(price), scale / price])
+
+    def scaled_training_data(self, X_train: np.ndarray, y_train: np.ndarray, last_close: float):
+        """
+        One ticker's rows in the pooled feature space: windows and targets
+        divided by its scale, static features appended to every window.
+
+        Returns:
+          X (n, window_size + 2), y (n,), scale, static feature vector
+        """
+        scale, static = self.ticker_features(last_close, y_train)
+        X = np.hstack([X_train / scale, np.tile(static, (len(X_train), 1))])
+        return X, y_train / scale, scale, static
+
+    def estimate(self, df: pd.DataFrame, ticker: str = None):
+        """
+        Single-ticker entry point; trains the pooled model on this ticker only.
+        Use estimate_batch() to pool across tickers.
+        """
+        ticker = ticker or "ticker"
+        predictions, errors = self.estimate_batch({ticker: df})
+        if ticker in errors:
+            raise errors[ticker]
+        return predictions[ticker], None
+
+    def estimate_batch(self, frames: dict):
+        """
+        Train one model on all tickers in `frames` and forecast each of them.
+
+        Returns:
+          predictions ({ticker: DataFrame like estimate()}),
+          errors ({ticker: Exception})
+        """
+        predictions = {}
+        errors = {}
+
+        tickers, closes, windows, indexes, scales, features = [], [], [], [], [], []
+        X_parts, y_parts = [], []
+        for ticker, df in frames.items():
+            try:
+                X_train, y_train, last_close, last_window, forecast_index = self.build_training_data(df)
+            except Exception as e:
+                errors[ticker] = e
+                continue
+
+            X_scaled, y_scaled, scale, static = self.scaled_training_data(X_train, y_train, last_close)
+            X_parts.append(X_scaled)
+            y_parts.append(y_scaled)
+
+            tickers.append(ticker)
+            closes.append(last_close)
+            windows.append(last_window / scale)
+            indexes.append(forecast_index)
+            scales.append(scale)
+            features.append(static)
+
+        if not tickers:
+            return predictions, errors
+
+        try:
+            self.train(np.vstack(X_parts), np.concatenate(y_parts), ticker=self.POOLED_KEY)
+        except Exception as e:
+            for ticker in tickers:
+                errors[ticker] = e
+            return predictions, errors
+
+        pred_prices, pred_changes = self.forecast_batch(
+            np.array(closes), np.vstack(windows),
+            static_features=np.vstack(features), scales=np.array(scales)
+        )
+
+        for k, ticker in enumerate(tickers):
+            predictions[ticker] = pd.DataFrame(
+                {
+                    "predicted_price": pred_prices[k],
+                    "predicted_change": pred_changes[k],
+                },
+                index=indexes[k],
+            )
+
+        return predictions, errors
+
+    def forecast(self, last_close: float, last_window: np.ndarray, y_train: np.ndarray = None):
+        """
+        Roll one ticker forward with the trained pooled model.
+
+        last_window: the ticker's most recent raw changes
+        y_train: the ticker's training targets, which set its scale as in
+                 estimate_batch() (default: the std of last_window)
+        """
+        scale, static = self.ticker_features(last_close, last_window if y_train is None else y_train)
+        pred_prices, pred_changes = self.forecast_batch(
+            np.array([last_close], dtype=float), np.asarray(last_window, dtype=float)[None, :] / scale,
+            static_features=static[None, :], scales=np.array([scale])
+        )
+        return pred_prices[0], pred_changes[0]
+
+
+def trend_interval_halfwidth(sigma, n_changepoints: int, delta_scale, dt: np.ndarray, interval_width: float):
+    """
+    Closed-form half width of a Prophet-style forecast interval.
+
+    Noise has std `sigma`. Future trend changes arrive at the historical rate
+    (n_changepoints per unit of scaled history) with Laplace magnitude
+    `delta_scale`, so the variance of the level offset `dt` scaled-time units
+    after the end of history is rate * 2 * delta_scale^2 * dt^3 / 3.
+    Works elementwise / with broadcasting on NumPy arrays.
+    """
+    dt = np.maximum(dt, 0.0)
+    trend_var = n_changepoints * 2.0 * np.square(delta_scale) * dt ** 3 / 3.0
+    z = NormalDist().inv_cdf(0.5 + interval_width / 2.0)
+    return z * np.sqrt(np.square(sigma) + trend_var)
+
+
 """ 
 LINEAR REGRESSION (less accurate short-term, more accurate long term) 
 """
 class LongEstimation(Estimation):
 
-    def __init__(self, horizon: int = 90):
+    # Prophet settings (part of the cache fingerprint)
+    PROPHET_PARAMS = {
+        "daily_seasonality": True,
+        "weekly_seasonality": True,
+        "yearly_seasonality": True,
+        "changepoint_prior_scale": 0.1,
+    }
+
+    INTERVAL_MODES = ("sampled", "reduced", "analytic", "lazy")
+
+    def __init__(self, horizon: int = 90, cache_dir: str = None, interval_mode: str = "sampled",
+                 interval_samples: int = 100):
         """
         horizon: number of future days to forecast
+        cache_dir: optional directory for fitted Prophet models and forecasts,
+                   keyed by ticker. When set, estimate(..., ticker=...) returns
+                   the cached forecast if the input is unchanged, and otherwise
+                   warm-starts Stan from the previous fit's parameters.
+        interval_mode: how yhat_lower/yhat_upper are produced
+            "sampled"  - Prophet default (1000 simulated trend paths)
+            "reduced"  - Prophet simulation with `interval_samples` paths
+            "analytic" - closed form from the fitted noise and changepoint scale
+            "lazy"     - skipped (NaN) during estimate(); compute_intervals(ticker)
+                         fills them in when a client asks for them
+        interval_samples: simulated paths for "reduced" mode
         """
+        if interval_mode not in self.INTERVAL_MODES:
+            raise ValueError(f"Unknown interval_mode {interval_mode!r}, expected one of {self.INTERVAL_MODES}")
+
         self.horizon = horizon
+        self.cache_dir = cache_dir
+        self.interval_mode = interval_mode
+        self.interval_samples = interval_samples
+
+        # ticker -> fitted model, kept for lazy intervals
+        self.models = {}
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
 
     # PREPROCESSING
     def preprocess_data(self, data: DataFrame) -> DataFrame:
@@ -230,33 +870,68 @@ class LongEstimation(Estimation):
         return df
 
     # MAIN ESTIMATION
-    def estimate(self, stock_data: DataFrame) -> DataFrame:
+    def estimate(self, stock_data: DataFrame, ticker: str = None) -> DataFrame:
         """
         Runs full pipeline:
         - preprocess data
         - fit Prophet
         - predict future prices
         - merge prediction results into a returned DataFrame
+
+        ticker: optional symbol, used to key the fitted-model cache
         """
 
         # 1. Preprocess
         df = self.preprocess_data(stock_data)
 
-        # 2. Fit Prophet model
-        model = Prophet(
-            daily_seasonality=True,
-            weekly_seasonality=True,
-            yearly_seasonality=True,
-            changepoint_prior_scale=0.1
-        )
-        model.fit(df)
+        use_cache = bool(self.cache_dir) and ticker is not None
+        if use_cache:
+            fingerprint = self.fingerprint(df)
+            cached = self.load_cached_forecast(ticker, fingerprint)
+            if cached is not None:
+                return cached
+
+        # 2. Fit Prophet model (warm-started from the previous fit when available)
+        model = self.fit_model(df, self.load_model(ticker) if use_cache else None)
+
+        if self.interval_mode == "lazy" and ticker is not None:
+            self.models[ticker] = model
+
+        # 3-6. Forecast (intervals according to interval_mode)
+        predictions = self.predict(model, self.interval_mode)
+
+        if use_cache:
+            self.save_cached(ticker, fingerprint, model, predictions)
+
+        return predictions
+
+    def predict(self, model: "Prophet", interval_mode: str) -> DataFrame:
+        """Forecast `self.horizon` days with a fitted model; see interval_mode in __init__."""
 
         # 3. Create future dataframe for forecasting
         future = model.make_future_dataframe(periods=self.horizon, include_history=False)
 
-        # 4. Predict
+        # 4. Predict (uncertainty_samples=0 makes Prophet skip the trend simulation)
+        if interval_mode == "sampled":
+            model.uncertainty_samples = 1000
+        elif interval_mode == "reduced":
+            model.uncertainty_samples = self.interval_samples
+        else:
+            model.uncertainty_samples = 0
         forecast = model.predict(future)
 
+        if interval_mode == "analytic":
+            t = ((future["ds"] - model.start) / model.t_scale).values
+            sigma = float(np.mean(model.params["sigma_obs"]))
+            delta_scale = float(np.mean(np.abs(model.params["delta"])))
+            half_width = trend_interval_halfwidth(sigma, len(model.changepoints_t), delta_scale,
+                                                  t - 1.0, model.interval_width) * model.y_scale
+            forecast["yhat_lower"] = forecast["yhat"].values - half_width
+            forecast["yhat_upper"] = forecast["yhat"].values + half_width
+        elif interval_mode == "lazy":
+            forecast["yhat_lower"] = np.nan
+            forecast["yhat_upper"] = np.nan
+
         # 5. Extract what matters
         predictions = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].copy()
         predictions.index.name = "Date"
@@ -265,4 +940,332 @@ class LongEstimation(Estimation):
         # merged = df.merge(predictions, on="ds", how="right")
         predictions.set_index("ds", inplace=True)
 
-        return predictions
\ No newline at end of file
+        return predictions
+
+    def compute_intervals(self, ticker: str) -> DataFrame:
+        """
+        Sampled yhat_lower/yhat_upper for a ticker estimated in "lazy" mode,
+        from the model kept in memory or, failing that, the cached model.
+        """
+        model = self.models.get(ticker)
+        if model is None and self.cache_dir:
+            model = self.load_model(ticker)
+        if model is None:
+            raise ValueError(f"No fitted long-term model for {ticker}")
+
+        return self.predict(model, "sampled")
+
+    def fit_model(self, df: DataFrame, previous: "Prophet" = None) -> "Prophet":
+        """
+        Fit Prophet on a ds/y frame. With a previous fit, its parameters are
+        the initial point for Stan's optimizer; if that fails (e.g. parameter
+        shapes changed) the model is refit from Prophet's default start.
+        """
+        from prophet import Prophet
+
+        if previous is not None:
+            try:
+                model = Prophet(**self.PROPHET_PARAMS)
+                return model.fit(df, init=self.warm_start_params(previous))
+            except Exception as e:
+                warnings.warn(f"Prophet warm start failed, refitting from scratch: {e}")
+
+        model = Prophet(**self.PROPHET_PARAMS)
+        return model.fit(df)
+
+    @staticmethod
+    def warm_start_params(model: "Prophet") -> dict:
+        """Initial values for Stan (k, m, sigma_obs, delta, beta) taken from a fitted model."""
+        params = {}
+        for name in ["k", "m", "sigma_obs"]:
+            params[name] = float(np.mean(model.params[name]))
+        for name in ["delta", "beta"]:
+            params[name] = np.mean(model.params[name], axis=0)
+        return params
+
+    # MODEL CACHE
+    def fingerprint(self, df: DataFrame) -> str:
+        """Hash of the training input and settings; equal hashes give equal forecasts."""
+        digest = hashlib.sha256()
+        settings = {**self.PROPHET_PARAMS, "horizon": self.horizon,
+                    "interval_mode": self.interval_mode, "interval_samples": self.interval_samples}
+        digest.update(json.dumps(settings, sort_keys=True).encode("utf-8"))
+        digest.update(df["ds"].values.astype("datetime64[ns]").tobytes())
+        digest.update(df["y"].values.astype(float).tobytes())
+        return digest.hexdigest()
+
+    def _cache_path(self, ticker: str, suffix: str) -> str:
+        return os.path.join(self.cache_dir, f"{ticker}.{suffix}.json")
+
+    def load_model(self, ticker: str):
+        """Previously fitted Prophet model for `ticker`, or None."""
+        path = self._cache_path(ticker, "model")
+        if not os.path.exists(path):
+            return None
+        try:
+            from prophet.serialize import model_from_json
+            with open(path) as f:
+                return model_from_json(f.read())
+        except Exception as e:
+            warnings.warn(f"Failed to load cached Prophet model for {ticker}: {e}")
+            return None
+
+    def load_cached_forecast(self, ticker: str, fingerprint: str):
+        """Cached predictions for `ticker` if they were made from the same input, else None."""
+        meta_path = self._cache_path(ticker, "meta")
+        forecast_path = self._cache_path(ticker, "forecast")
+        if not (os.path.exists(meta_path) and os.path.exists(forecast_path)):
+            return None
+        try:
+            with open(meta_path) as f:
+                if json.load(f).get("fingerprint") != fingerprint:
+                    return None
+            predictions = pd.read_json(forecast_path, orient="split")
+            predictions.index = pd.to_datetime(predictions.index)
+            predictions.index.name = "ds"
+            return predictions
+        except Exception as e:
+            warnings.warn(f"Failed to load cached forecast for {ticker}: {e}")
+            return None
+
+    def save_cached(self, ticker: str, fingerprint: str, model: "Prophet", predictions: DataFrame):
+        """Store the fitted model (Prophet JSON), its forecast and fingerprint."""
+        try:
+            from prophet.serialize import model_to_json
+            with open(self._cache_path(ticker, "model"), "w") as f:
+                f.write(model_to_json(model))
+            predictions.to_json(self._cache_path(ticker, "forecast"), orient="split", date_format="iso", double_precision=15)
+            # Meta last: a forecast only counts as cached once its fingerprint is written
+            with open(self._cache_path(ticker, "meta"), "w") as f:
+                json.dump({"fingerprint": fingerprint}, f)
+        except Exception as e:
+            warnings.warn(f"Failed to cache Prophet model for {ticker}: {e}")
+
+    def estimate_stream(self, frames: dict, budget=None):
+        """
+        Run estimate() for many tickers, yielding results as they finish.
+
+        frames: {ticker: DataFrame} as accepted by estimate().
+        budget: optional ComputeBudget; with more than one worker, Prophet fits
+                are fanned out to its process pool (each worker limited to its
+                thread share) and yielded in completion order.
+
+        Yields:
+          (ticker, predictions or None, exception or None). A failing ticker
+          is reported through its exception and does not stop the batch.
+        """
+        if budget is None or budget.workers <= 1 or len(frames) <= 1:
+            for ticker, df in frames.items():
+                try:
+                    result = (ticker, self.estimate(df, ticker=ticker), None)
+                except Exception as e:
+                    result = (ticker, None, e)
+                yield result
+            return
+
+        # Workers get a copy without the fitted models; each returns its own
+        worker = copy.copy(self)
+        worker.models = {}
+        with budget.executor() as pool:
+            futures = {pool.submit(_estimate_long, worker, df, ticker): ticker for ticker, df in frames.items()}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    predictions, model = future.result()
+                    if model is not None:
+                        self.models[ticker] = model
+                    result = (ticker, predictions, None)
+                except Exception as e:
+                    result = (ticker, None, e)
+                yield result
+
+
+def _estimate_long(est: LongEstimation, df: DataFrame, ticker: str):
+    """
+    Process-pool worker for LongEstimation.estimate_stream().
+    Returns (predictions, fitted model kept for lazy intervals or None).
+    """
+    predictions = est.estimate(df, ticker=ticker)
+    return predictions, est.models.get(ticker)
+
+
+""" 
+PIECEWISE-LINEAR TREND + FOURIER SEASONALITY (NumPy least squares, Prophet-like)
+"""
+class FastLongEstimation(LongEstimation):
+    """
+    Pure NumPy alternative to LongEstimation.
+
+    Fits the same kind of model Prophet fits for our data, a piecewise-linear
+    trend with `n_changepoints` potential slope changes plus weekly and yearly
+    Fourier terms, as a ridge-regularized least-squares problem. Tickers that
+    share the same dates share one design matrix, so a whole watchlist is
+    solved with a single factorization.
+
+    Returns the same frame as LongEstimation (index "ds", columns yhat,
+    yhat_lower, yhat_upper). Intervals are analytic: residual noise plus the
+    trend uncertainty Prophet simulates (future changepoints at the
+    historical rate with the historical average magnitude).
+    """
+
+    def __init__(self, horizon: int = 90, n_changepoints: int = 25, changepoint_range: float = 0.8,
+                 weekly_order: int = 3, yearly_order: int = 10, changepoint_penalty: float = 1.0,
+                 seasonality_penalty: float = 0.1, interval_width: float = 0.8):
+        """
+        horizon: number of future days to forecast
+        n_changepoints: potential trend changepoints, evenly spread over the
+                        first `changepoint_range` of the history
+        weekly_order / yearly_order: Fourier orders of the seasonalities
+        changepoint_penalty / seasonality_penalty: ridge strength on slope
+                        changes / Fourier coefficients (larger = smoother)
+        interval_width: coverage of yhat_lower..yhat_upper (Prophet default 0.8)
+        """
+        super().__init__(horizon=horizon)
+        self.n_changepoints = n_changepoints
+        self.changepoint_range = changepoint_range
+        self.weekly_order = weekly_order
+        self.yearly_order = yearly_order
+        self.changepoint_penalty = changepoint_penalty
+        self.seasonality_penalty = seasonality_penalty
+        self.interval_width = interval_width
+
+    @staticmethod
+    def fourier(days: np.ndarray, period: float, order: int) -> np.ndarray:
+        """Fourier terms (sin, cos for k = 1..order) of `days` for a given period."""
+        if order <= 0:
+            return np.empty((len(days), 0))
+        angles = 2.0 * np.pi * np.outer(days / period, np.arange(1, order + 1))
+        return np.hstack([np.sin(angles), np.cos(angles)])
+
+    def design_matrix(self, days: np.ndarray, t: np.ndarray, changepoints: np.ndarray) -> np.ndarray:
+        """Columns: intercept, slope, one hinge per changepoint, weekly and yearly Fourier terms."""
+        return np.hstack([
+            np.ones((len(t), 1)),
+            t[:, None],
+            np.maximum(t[:, None] - changepoints[None, :], 0.0),
+            self.fourier(days, 7.0, self.weekly_order),
+            self.fourier(days, 365.25, self.yearly_order),
+        ])
+
+    def fit_predict(self, ds: np.ndarray, Y: np.ndarray):
+        """
+        Fit and forecast every column of Y on the shared dates `ds`.
+
+        ds: datetime64 array of shape (n_obs,), sorted
+        Y: array of shape (n_obs, n_series)
+
+        Returns:
+          future dates (horizon,), yhat, yhat_lower, yhat_upper (each (horizon, n_series))
+        """
+        n_obs = len(ds)
+        if n_obs < 2:
+            raise ValueError("Need at least 2 observations to fit a trend.")
+
+        days = ds.astype("datetime64[ns]").astype(np.int64) / 86_400e9
+        start, span = days[0], max(days[-1] - days[0], 1.0)
+        t = (days - start) / span
+
+        # Changepoints at evenly spaced rows of the first `changepoint_range` of history
+        n_cp = min(self.n_changepoints, max(int(self.changepoint_range * n_obs) - 1, 0))
+        cp_rows = np.linspace(0, int(self.changepoint_range * (n_obs - 1)), n_cp + 1).round().astype(int)[1:]
+        changepoints = t[cp_rows]
+
+        A = self.design_matrix(days, t, changepoints)
+
+        # Scale each series to max |y| = 1 so one penalty fits all tickers
+        scale = np.abs(Y).max(axis=0)
+        scale[scale == 0] = 1.0
+        Ys = Y / scale
+
+        penalty = np.zeros(A.shape[1])
+        penalty[2:2 + n_cp] = self.changepoint_penalty
+        penalty[2 + n_cp:] = self.seasonality_penalty
+        coef = np.linalg.solve(A.T @ A + np.diag(penalty + 1e-10), A.T @ Ys)
+
+        sigma = (Ys - A @ coef).std(axis=0)
+
+        future_days = days[-1] + np.arange(1, self.horizon + 1)
+        future_t = (future_days - start) / span
+        yhat = self.design_matrix(future_days, future_t, changepoints) @ coef
+
+        # Trend uncertainty with Laplace magnitude = mean |delta| per series
+        lam = np.abs(coef[2:2 + n_cp]).mean(axis=0) if n_cp else np.zeros(Y.shape[1])
+        half_width = trend_interval_halfwidth(sigma[None, :], n_cp, lam[None, :],
+                                              (future_t - 1.0)[:, None], self.interval_width)
+
+        future_ds = (ds[-1].astype("datetime64[D]") + np.arange(1, self.horizon + 1)).astype("datetime64[ns]")
+        return future_ds, yhat * scale, (yhat - half_width) * scale, (yhat + half_width) * scale
+
+    def series(self, stock_data: DataFrame):
+        """
+        (ds, y) arrays with the same cleaning as preprocess_data(), without
+        building the intermediate frame for the common DatetimeIndex case.
+        """
+        if "Date" in stock_data.columns or not isinstance(stock_data.index, pd.DatetimeIndex):
+            df = self.preprocess_data(stock_data)
+            return df["ds"].values.astype("datetime64[ns]"), df["y"].values.astype(float)
+
+        ds = stock_data.index.values.astype("datetime64[ns]")
+        y = stock_data["Close"].values.astype(float)
+        keep = ~np.isnan(y)
+        ds, y = ds[keep], y[keep]
+        if len(ds) > 1 and not (ds[1:] >= ds[:-1]).all():
+            order = np.argsort(ds, kind="stable")
+            ds, y = ds[order], y[order]
+        return ds, y
+
+    def estimate(self, stock_data: DataFrame, ticker: str = None) -> DataFrame:
+        ticker = ticker or "ticker"
+        predictions, errors = self.estimate_batch({ticker: stock_data})
+        if ticker in errors:
+            raise errors[ticker]
+        return predictions[ticker]
+
+    def estimate_batch(self, frames: dict):
+        """
+        Fit all tickers, solving tickers with identical dates together.
+
+        Returns:
+          predictions ({ticker: DataFrame like LongEstimation.estimate()}),
+          errors ({ticker: Exception})
+        """
+        predictions = {}
+        errors = {}
+
+        # Group tickers by their (cleaned) date grid
+        groups = {}
+        for ticker, stock_data in frames.items():
+            try:
+                ds, y = self.series(stock_data)
+                key = hashlib.sha1(ds.tobytes()).hexdigest()
+                groups.setdefault(key, (ds, [], []))
+                groups[key][1].append(ticker)
+                groups[key][2].append(y)
+            except Exception as e:
+                errors[ticker] = e
+
+        for ds, tickers, ys in groups.values():
+            try:
+                future_ds, yhat, lower, upper = self.fit_predict(ds, np.column_stack(ys))
+            except Exception as e:
+                for ticker in tickers:
+                    errors[ticker] = e
+                continue
+
+            index = pd.DatetimeIndex(future_ds, name="ds")
+            for k, ticker in enumerate(tickers):
+                predictions[ticker] = DataFrame(
+                    {"yhat": yhat[:, k], "yhat_lower": lower[:, k], "yhat_upper": upper[:, k]},
+                    index=index,
+                )
+
+        return predictions, errors
+
+    def estimate_stream(self, frames: dict, budget=None):
+        """
+        Same contract as LongEstimation.estimate_stream(); everything is
+        solved in one batch, so no process pool is used.
+        """
+        predictions, errors = self.estimate_batch(frames)
+        for ticker in frames:
+            yield ticker, predictions.get(ticker), errors.get(ticker)
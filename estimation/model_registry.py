@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import pickle
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+
+
+class ModelRegistry:
+    """
+    Cache of trained models, kept in a memory LRU and on disk.
+
+    Models are keyed by ticker, hyperparameters, window size and a hash of
+    the training window, so a model is only reused when it would have been
+    trained on exactly the same samples with exactly the same settings.
+    Every refresh with new data adds a new key, so the disk cache is pruned
+    least recently used first once it exceeds `max_disk_models` files or
+    `max_disk_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = 'model_cache', max_models: int = 128, max_disk_models: int = 1024,
+                 max_disk_bytes: int = 256 * 1024 ** 2):
+        """
+        cache_dir: directory for pickled models (None = memory only)
+        max_models: number of models kept in the in-memory LRU
+        max_disk_models: number of pickled models kept on disk
+        max_disk_bytes: total size of the pickled models kept on disk
+        """
+        self.cache_dir = cache_dir
+        self.max_models = max_models
+        self.max_disk_models = max_disk_models
+        self.max_disk_bytes = max_disk_bytes
+        self.models = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(ticker, params: dict, window_size: int, X_train: np.ndarray, y_train: np.ndarray) -> str:
+        """Build the cache key for one training run."""
+        digest = hashlib.sha256()
+        digest.update(str(ticker).encode('utf-8'))
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(str(window_size).encode('utf-8'))
+        for arr in (X_train, y_train):
+            arr = np.ascontiguousarray(arr, dtype=float)
+            digest.update(str(arr.shape).encode('utf-8'))
+            digest.update(arr.tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, key: str):
+        """Return the cached model for `key`, or None (counted as a miss)."""
+        if key in self.models:
+            self.models.move_to_end(key)
+            self.hits += 1
+            return self.models[key]
+
+        if self.cache_dir and os.path.exists(self._path(key)):
+            model = None
+            try:
+                with open(self._path(key), 'rb') as f:
+                    model = pickle.load(f)
+            except FileNotFoundError:
+                # Pruned by another process since the exists() check
+                pass
+            except Exception as e:
+                warnings.warn(f"Failed to load cached model {key}: {e}")
+
+            if model is not None:
+                # Mark as recently used for disk pruning; the model is already
+                # loaded, so losing a race with another process's prune is harmless
+                try:
+                    os.utime(self._path(key))
+                except OSError:
+                    pass
+                self._remember(key, model)
+                self.hits += 1
+                return model
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, model):
+        """Store a trained model in memory and on disk."""
+        self._remember(key, model)
+
+        if self.cache_dir:
+            try:
+                tmp_path = self._path(key) + '.tmp'
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(model, f)
+                os.replace(tmp_path, self._path(key))
+                self._prune_disk()
+            except Exception as e:
+                warnings.warn(f"Failed to save model {key}: {e}")
+
+    def _remember(self, key: str, model):
+        self.models[key] = model
+        self.models.move_to_end(key)
+        while len(self.models) > self.max_models:
+            self.models.popitem(last=False)
+
+    def _prune_disk(self):
+        """Delete the least recently used pickles until both disk limits hold."""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                # Other processes sharing the cache may delete files meanwhile
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, name))
+        count, size = len(files), sum(f[1] for f in files)
+        if count <= self.max_disk_models and size <= self.max_disk_bytes:
+            return
+
+        for _, file_size, name in sorted(files):
+            if count <= self.max_disk_models and size <= self.max_disk_bytes:
+                break
+            # Always keep the newest model
+            if count == 1:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            count -= 1
+            size -= file_size
+
+    def worker_copy(self) -> "ModelRegistry":
+        """
+        Empty registry sharing this one's disk cache, cheap to send to a
+        worker process (the in-memory LRU is not pickled along).
+        """
+        return ModelRegistry(self.cache_dir, self.max_models, self.max_disk_models, self.max_disk_bytes)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for reporting."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'in_memory': len(self.models),
+        }
+
+    def clear(self):
+        """Drop all cached models (memory and disk) and reset counters."""
+        self.models.clear()
+        self.hits = 0
+        self.misses = 0
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, name))
@@ -0,0 +1,214 @@
+import json
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from estimation.estimation import ShortEstimation
+from estimation.compute_budget import ComputeBudget
+
+
+# Search space for ShortEstimation (window_size + LightGBM params)
+SEARCH_SPACE = {
+    "window_size": [5, 10, 15, 21],
+    "learning_rate": [0.01, 0.03, 0.05, 0.1],
+    "num_leaves": [7, 15, 31, 63],
+    "min_child_samples": [10, 20, 40],
+    "colsample_bytree": [0.7, 0.9, 1.0],
+    "reg_lambda": [0.0, 1.0, 5.0],
+}
+
+UNIVERSE_KEY = "__universe__"
+
+
+def sample_candidates(n_candidates: int, space: dict = None, seed: int = 0) -> list:
+    """Draw `n_candidates` distinct random configurations from the search space."""
+    space = space or SEARCH_SPACE
+    rng = np.random.default_rng(seed)
+    seen = set()
+    candidates = []
+    for _ in range(n_candidates * 20):
+        cand = {name: values[rng.integers(len(values))] for name, values in space.items()}
+        key = json.dumps(cand, sort_keys=True, default=float)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(cand)
+        if len(candidates) == n_candidates:
+            break
+    return candidates
+
+
+def _evaluate(candidate: dict, series: list, n_estimators: int, valid_fraction: float,
+              early_stopping_rounds: int, n_jobs: int):
+    """
+    Process-pool worker: score one candidate with a `n_estimators` budget.
+
+    Each series (array of daily changes) is split in time order: the last
+    `valid_fraction` of its windows is the validation set. The model stops
+    early on validation l2. The score is the mean validation RMSE divided by
+    each series' target std, so tickers with different price scales count
+    equally.
+
+    Returns:
+      score, best_iteration (median over series)
+    """
+    import lightgbm as lgb
+
+    params = {k: v for k, v in candidate.items() if k != "window_size"}
+    window_size = candidate.get("window_size", 10)
+
+    scores, iterations = [], []
+    for changes in series:
+        X, y = ShortEstimation.build_windows(changes, window_size)
+        n_valid = int(len(X) * valid_fraction)
+        if n_valid < 5 or len(X) - n_valid < 20:
+            continue
+
+        X_tr, y_tr = X[:-n_valid], y[:-n_valid]
+        X_va, y_va = X[-n_valid:], y[-n_valid:]
+
+        model = lgb.LGBMRegressor(**{
+            **ShortEstimation.DEFAULT_PARAMS, **params,
+            "n_estimators": n_estimators, "n_jobs": n_jobs, "verbose": -1,
+        })
+        model.fit(
+            X_tr, y_tr,
+            eval_set=[(X_va, y_va)],
+            callbacks=[lgb.early_stopping(early_stopping_rounds, verbose=False)],
+        )
+
+        rmse = float(np.sqrt(model.best_score_["valid_0"]["l2"]))
+        scale = float(np.std(y_va)) or 1.0
+        scores.append(rmse / scale)
+        iterations.append(model.best_iteration_ or n_estimators)
+
+    if not scores:
+        return np.inf, n_estimators
+    return float(np.mean(scores)), int(np.median(iterations))
+
+
+class HyperparameterSearch:
+    """
+    Successive-halving search over window_size and LightGBM parameters for
+    ShortEstimation, with early stopping on a time-ordered validation split.
+
+    Every rung trains all surviving candidates with a tree budget, keeps the
+    best 1/eta and multiplies the budget by eta. Trials run in a process pool.
+    The best config records the early-stopped tree count, so production
+    models only train as many trees as validation asked for.
+    """
+
+    def __init__(self, n_candidates: int = 27, eta: int = 3, min_trees: int = 100, max_trees: int = 2000,
+                 valid_fraction: float = 0.2, early_stopping_rounds: int = 50, budget: ComputeBudget = None,
+                 space: dict = None, seed: int = 0):
+        """
+        n_candidates: configurations in the first rung
+        eta: halving rate (keep 1/eta per rung, budget x eta)
+        min_trees / max_trees: tree budget of the first / last rung
+        valid_fraction: share of the most recent windows used for validation
+        early_stopping_rounds: rounds without validation improvement before stopping
+        budget: ComputeBudget deciding pool size and LightGBM threads per trial
+                (default: one single-threaded worker per core; 1 worker = run inline)
+        space: search space overriding SEARCH_SPACE
+        """
+        self.n_candidates = n_candidates
+        self.eta = eta
+        self.min_trees = min_trees
+        self.max_trees = max_trees
+        self.valid_fraction = valid_fraction
+        self.early_stopping_rounds = early_stopping_rounds
+        self.budget = budget or ComputeBudget()
+        self.space = space or SEARCH_SPACE
+        self.seed = seed
+        self.history = []
+
+    @staticmethod
+    def _changes(df: pd.DataFrame) -> np.ndarray:
+        return df.sort_index()["Close"].diff().values.astype(float)
+
+    def _run_rung(self, pool, candidates, series, n_estimators):
+        args = (series, n_estimators, self.valid_fraction, self.early_stopping_rounds,
+                self.budget.threads_per_worker)
+        if pool is None:
+            return [_evaluate(cand, *args) for cand in candidates]
+        futures = [pool.submit(_evaluate, cand, *args) for cand in candidates]
+        return [f.result() for f in futures]
+
+    def search(self, frames: dict) -> dict:
+        """
+        Find the best config for all series in `frames` together
+        ({ticker: DataFrame with a Close column}).
+
+        Returns:
+          {"window_size": int, "params": {...LightGBM params...}, "score": float}
+        """
+        series = [self._changes(df) for df in frames.values()]
+        candidates = sample_candidates(self.n_candidates, self.space, self.seed)
+        n_estimators = self.min_trees
+
+        pool = self.budget.executor() if self.budget.workers > 1 else None
+        try:
+            while True:
+                results = self._run_rung(pool, candidates, series, n_estimators)
+                for cand, (score, best_iter) in zip(candidates, results):
+                    self.history.append({**cand, "n_estimators": n_estimators, "score": score,
+                                         "best_iteration": best_iter})
+
+                order = np.argsort([score for score, _ in results])
+                last_rung = len(candidates) <= 1 or n_estimators >= self.max_trees
+                if last_rung:
+                    best = order[0]
+                    best_cand, (best_score, best_iter) = candidates[best], results[best]
+                    break
+
+                keep = max(1, len(candidates) // self.eta)
+                candidates = [candidates[i] for i in order[:keep]]
+                n_estimators = min(n_estimators * self.eta, self.max_trees)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        params = {k: v for k, v in best_cand.items() if k != "window_size"}
+        params["n_estimators"] = int(best_iter)
+        return {"window_size": int(best_cand["window_size"]), "params": params, "score": float(best_score)}
+
+    def search_per_ticker(self, frames: dict) -> dict:
+        """Run search() separately for each ticker. Returns {ticker: config}."""
+        configs = {}
+        for ticker, df in frames.items():
+            try:
+                configs[ticker] = self.search({ticker: df})
+            except Exception as e:
+                warnings.warn(f"Hyperparameter search failed for {ticker}: {e}")
+        return configs
+
+
+def save_configs(configs: dict, path: str = "tuned_params.json"):
+    """
+    Merge configs into a JSON file. Keys are tickers, or UNIVERSE_KEY for a
+    config tuned on all tickers together.
+    """
+    existing = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            existing = json.load(f)
+    existing.update(configs)
+    with open(path, "w") as f:
+        json.dump(existing, f, indent=2, default=float)
+
+
+def load_configs(path: str = "tuned_params.json") -> dict:
+    """Every saved config, keyed by ticker or UNIVERSE_KEY ({} if the file does not exist)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_config(path: str = "tuned_params.json", ticker: str = None):
+    """Best config for `ticker`, falling back to the universe config (None if neither exists)."""
+    configs = load_configs(path)
+    if ticker is not None and ticker in configs:
+        return configs[ticker]
+    return configs.get(UNIVERSE_KEY)
@@ -1,5 +1,3 @@
-from matplotlib import pyplot as plt
-
 from managers.managers import Manager
 from managers.link import Link
 from estimation.estimation import ShortEstimation, LongEstimation
@@ -20,6 +18,7 @@ print(manager.user_manager.get_user('lukasdim').positions)
 
 """
 #old testing with individual components
+from matplotlib import pyplot as plt
 
 manager = DataManager()
 
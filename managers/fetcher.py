@@ -0,0 +1,170 @@
+import random
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from pandas import DataFrame
+
+
+# Where a ticker's data came from in the last fetch
+SOURCE_REMOTE = 'yfinance'
+SOURCE_CACHE = 'cache'
+SOURCE_DATABASE = 'database'
+SOURCE_MISSING = 'missing'
+
+
+def ticker_rows(downloaded: DataFrame, ticker: str):
+    """One ticker's bars from a (Ticker, Price) or (Price, Ticker) download, or None if missing."""
+    if downloaded is None or downloaded.empty:
+        return None
+    if isinstance(downloaded.columns, pd.MultiIndex):
+        if ticker in downloaded.columns.get_level_values(0):
+            return downloaded[ticker]
+        if ticker in downloaded.columns.get_level_values(1):
+            return downloaded.xs(ticker, axis=1, level=1)
+        return None
+    return downloaded
+
+
+def yfinance_provider(tickers: list, **kwargs) -> DataFrame:
+    """Default provider: one yf.download call for `tickers`, grouped by ticker."""
+    import yfinance as yf
+    # The fetcher runs its own thread pool, so yfinance's is disabled
+    return yf.download(tickers, interval="1d", actions=True, group_by='ticker',
+                       progress=False, threads=False, **kwargs)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`.
+    acquire() blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float = None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0):
+        while True:
+            with self._lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+class MarketDataFetcher:
+    """
+    Chunked, concurrent, rate-limited price downloads with per-ticker fallback.
+
+    Tickers are split into chunks of `chunk_size`; each chunk is one provider
+    request, run on a pool of `max_workers` threads and gated by a token
+    bucket (`rate` requests/s, bursts of `burst`). Tickers missing from a
+    response, or whose request raised, are retried up to `max_retries` times
+    with exponential backoff and random jitter. Only the tickers that still
+    fail go to the `fallback` passed to fetch(), so a throttled symbol does
+    not send the whole universe to stale data.
+
+    `provider(tickers, **kwargs)` returns a wide frame with one column group
+    per ticker (yfinance_provider by default); tests can pass a fake.
+    """
+
+    def __init__(self, provider=None, chunk_size: int = 50, max_workers: int = 4, rate: float = 2.0,
+                 burst: float = 4, max_retries: int = 2, backoff: float = 1.0, jitter: float = 0.5,
+                 seed: int = None, sleep=time.sleep):
+        """
+        provider: callable(tickers, **kwargs) -> DataFrame (default yfinance_provider)
+        chunk_size: tickers per provider request
+        max_workers: concurrent requests
+        rate, burst: token bucket (requests per second, burst capacity)
+        max_retries: retries for tickers missing after a request
+        backoff, jitter: retry n sleeps backoff * 2**(n-1) * (1 + jitter * U[0, 1)) seconds
+        seed: seed for the jitter
+        sleep: sleep function for retry backoff (injectable for tests)
+        """
+        self.provider = provider or yfinance_provider
+        self.chunk_size = max(1, chunk_size)
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.jitter = jitter
+        self.sleep = sleep
+        self.bucket = TokenBucket(rate, burst)
+        self._random = random.Random(seed)
+        self.last_report = {}
+
+    @classmethod
+    def from_config(cls, config=None) -> "MarketDataFetcher":
+        """Build from a dict of constructor kwargs (None = defaults) or pass an instance through."""
+        if isinstance(config, cls):
+            return config
+        return cls(**(config or {}))
+
+    def _fetch_chunk(self, chunk: list, kwargs: dict) -> dict:
+        frames = {}
+        remaining = list(chunk)
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.sleep(self.backoff * 2 ** (attempt - 1) * (1 + self.jitter * self._random.random()))
+            self.bucket.acquire()
+            try:
+                downloaded = self.provider(remaining, **kwargs)
+            except Exception as e:
+                warnings.warn(f"Download failed for {len(remaining)} ticker(s) (attempt {attempt + 1}): {e}")
+                continue
+
+            for ticker in remaining:
+                rows = ticker_rows(downloaded, ticker)
+                if rows is not None:
+                    rows = rows.dropna(how='all')
+                    if not rows.empty:
+                        frames[ticker] = rows
+            remaining = [ticker for ticker in remaining if ticker not in frames]
+            if not remaining:
+                break
+        return frames
+
+    def fetch(self, tickers: list, fallback=None, **kwargs):
+        """
+        Download `tickers` (kwargs go to the provider, e.g. period="1y" or start=...).
+
+        fallback: optional callable(tickers) -> ({ticker: DataFrame}, {ticker: source name}),
+                  called once with every ticker the provider could not deliver.
+        Returns (frames, sources): {ticker: DataFrame} and {ticker: source},
+        where source is 'yfinance', the fallback's source name, or 'missing'.
+        The report is also kept in last_report.
+        """
+        tickers = list(dict.fromkeys(tickers))
+        chunks = [tickers[i:i + self.chunk_size] for i in range(0, len(tickers), self.chunk_size)]
+
+        frames = {}
+        if chunks:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                for chunk_frames in pool.map(lambda chunk: self._fetch_chunk(chunk, kwargs), chunks):
+                    frames.update(chunk_frames)
+
+        sources = {ticker: SOURCE_REMOTE for ticker in frames}
+        missing = [ticker for ticker in tickers if ticker not in frames]
+        if missing and fallback:
+            fallback_frames, fallback_sources = fallback(missing)
+            for ticker in missing:
+                frame = fallback_frames.get(ticker)
+                if frame is not None and not frame.empty:
+                    frames[ticker] = frame
+                    sources[ticker] = fallback_sources[ticker]
+        for ticker in missing:
+            sources.setdefault(ticker, SOURCE_MISSING)
+
+        self.last_report = sources
+        return frames, sources
@@ -0,0 +1,129 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+from managers.ohlcv_store import OHLCVStore
+
+
+class HistoryCache:
+    """
+    Local per-ticker price history used by incremental downloads.
+
+    Each ticker keeps the daily OHLCV (+ Dividends / Stock Splits) frame from
+    its last full pull, extended by the small delta fetched on each refresh.
+    Histories are trimmed to a rolling `window` so they match what a full
+    period="1y" download would return, and are written to an OHLCVStore
+    (one memory-mapped columnar file per ticker) when `cache_dir` is set, so a
+    restart does not need the network or a full re-pull.
+    """
+
+    ACTION_COLUMNS = ('Dividends', 'Stock Splits')
+
+    def __init__(self, cache_dir: str = None, window: pd.DateOffset = pd.DateOffset(years=1), rtol: float = 1e-6):
+        """
+        cache_dir: directory for the on-disk OHLCVStore (None = memory only)
+        window: how much history to keep per ticker
+        rtol: relative tolerance when checking re-downloaded overlap bars
+        """
+        self.cache_dir = cache_dir
+        self.window = window
+        self.rtol = rtol
+        self.histories = {}
+        self.store = OHLCVStore(cache_dir) if cache_dir else None
+        self._lock = threading.RLock()
+
+    def get(self, ticker: str):
+        """Cached history for `ticker`, or None."""
+        with self._lock:
+            if ticker in self.histories:
+                return self.histories[ticker]
+
+            history = self.store.read(ticker) if self.store else None
+            if history is not None:
+                self.histories[ticker] = history
+            return history
+
+    def last_date(self, ticker: str):
+        """Last cached bar date for `ticker`, or None if a full pull is needed."""
+        history = self.get(ticker)
+        if history is None or history.empty:
+            return None
+        return history.index[-1]
+
+    def put(self, ticker: str, history: DataFrame):
+        """Replace the history for `ticker` (used after a full pull)."""
+        history = history.dropna(how='all').sort_index()
+        history = history[~history.index.duplicated(keep='last')]
+        if not history.empty:
+            history = history[history.index >= history.index[-1] - self.window]
+
+        with self._lock:
+            self.histories[ticker] = history
+            if self.store:
+                self.store.write(ticker, history)
+
+    def delta_start(self, ticker: str):
+        """
+        Date to start the next delta download from, or None if a full pull is needed.
+
+        This is the second-to-last cached bar: it is settled, so re-downloading
+        it shows whether adjusted history changed, while the last bar may have
+        been cached intraday and is simply replaced.
+        """
+        history = self.get(ticker)
+        if history is None or history.empty:
+            return None
+        return history.index[-2] if len(history) > 1 else history.index[-1]
+
+    def append(self, ticker: str, delta: DataFrame) -> bool:
+        """
+        Merge a delta download (starting at delta_start(ticker)) into the history.
+
+        Returns False, storing nothing, when adjusted history has changed: the
+        re-downloaded anchor bar no longer matches, or a new bar carries a
+        dividend or split that was not cached. The caller then does a full
+        re-pull for the ticker.
+        """
+        history = self.get(ticker)
+        anchor = self.delta_start(ticker)
+        if anchor is None:
+            return False
+
+        delta = delta.dropna(how='all').sort_index()
+        overlap = delta[delta.index <= anchor]
+        fresh = delta[delta.index > anchor]
+
+        if not overlap.empty and 'Close' in overlap.columns:
+            common = overlap.index.intersection(history.index)
+            old_close = history.loc[common, 'Close'].to_numpy(dtype=float)
+            new_close = overlap.loc[common, 'Close'].to_numpy(dtype=float)
+            if not np.allclose(old_close, new_close, rtol=self.rtol, equal_nan=True):
+                return False
+
+        for col in self.ACTION_COLUMNS:
+            if col in fresh.columns:
+                cached = history[col].reindex(fresh.index) if col in history.columns else None
+                cached = cached.fillna(0) if cached is not None else 0
+                if (fresh[col].fillna(0) != cached).any():
+                    return False
+
+        if not fresh.empty:
+            base = history[history.index <= anchor]
+            self.put(ticker, pd.concat([base, fresh.reindex(columns=history.columns)]))
+        return True
+
+    def frame(self, tickers: list) -> DataFrame:
+        """Wide (Ticker, Price) frame for `tickers`, same layout as the database fallback."""
+        histories = {ticker: self.get(ticker) for ticker in tickers}
+        histories = {ticker: h for ticker, h in histories.items() if h is not None and not h.empty}
+        if not histories:
+            return DataFrame()
+        return pd.concat(histories, axis=1, names=['Ticker', 'Price'])
+
+    def remove(self, ticker: str):
+        with self._lock:
+            self.histories.pop(ticker, None)
+            if self.store:
+                self.store.remove(ticker)
@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+import uuid
+import warnings
+from collections import OrderedDict
+
+
+class RefreshJob:
+    """
+    One estimation refresh run in the background, with per-ticker progress.
+
+    status: 'queued' -> 'running' -> 'succeeded' | 'failed'
+    tickers: {ticker: {'status', 'started', 'finished', 'seconds', 'error'}}
+    options: keyword arguments the refresh is run with
+    """
+
+    def __init__(self, job_id: str, options: dict = None):
+        self.id = job_id
+        self.options = options or {}
+        self.status = 'queued'
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.error = None
+        self.requests = 1
+        self.tickers = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.status in ('queued', 'running')
+
+    def progress(self, ticker: str, event: str, error: Exception = None):
+        """Progress callback passed to Manager.update_estimations ('started', 'done', 'failed' or 'skipped')."""
+        now = time.time()
+        with self._lock:
+            entry = self.tickers.setdefault(ticker, {
+                'status': 'queued', 'started': None, 'finished': None, 'seconds': None, 'error': None,
+            })
+            if event == 'started':
+                entry['status'] = 'running'
+                entry['started'] = now
+            elif event == 'skipped':
+                entry['status'] = 'skipped'
+            else:
+                entry['status'] = 'succeeded' if event == 'done' else 'failed'
+                entry['finished'] = now
+                if entry['started'] is not None:
+                    entry['seconds'] = now - entry['started']
+                if error is not None:
+                    entry['error'] = str(error)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            tickers = {ticker: dict(entry) for ticker, entry in self.tickers.items()}
+        counts = {}
+        for entry in tickers.values():
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        return {
+            'id': self.id,
+            'status': self.status,
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+            'seconds': (self.finished or time.time()) - self.started if self.started else None,
+            'error': self.error,
+            'options': self.options,
+            'merged_requests': self.requests,
+            'progress': counts,
+            'tickers': tickers,
+        }
+
+
+class JobManager:
+    """
+    Runs refresh jobs one at a time on a background thread.
+
+    submit() returns the job that will serve the request: a request joins a
+    queued job with the same options instead of adding another run. A job
+    that is already running may have read its data before the request was
+    made, so the request queues one follow-up job instead (at most one
+    pending per set of options). Finished jobs are kept (up to `max_jobs`)
+    so their status can still be read.
+    """
+
+    def __init__(self, run, max_jobs: int = 100):
+        """
+        run: callable(progress, **options) doing the refresh; `progress` is
+             RefreshJob.progress for the job being run and `options` are
+             the keyword arguments given to submit()
+        max_jobs: finished jobs kept for status lookups
+        """
+        self.run = run
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+
+    def submit(self, **options):
+        """
+        Return (job, created); created is False when merged into a queued job
+        with the same options.
+        """
+        with self._lock:
+            for job in self.jobs.values():
+                if job.status == 'queued' and job.options == options:
+                    job.requests += 1
+                    return job, False
+
+            job = RefreshJob(uuid.uuid4().hex, options)
+            self.jobs[job.id] = job
+            while len(self.jobs) > self.max_jobs:
+                oldest = next(iter(self.jobs.values()))
+                if oldest.active:
+                    break
+                self.jobs.popitem(last=False)
+
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name='refresh-jobs', daemon=True)
+                self._worker.start()
+            self._queue.put(job)
+            return job, True
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            job.status = 'running'
+            job.started = time.time()
+            try:
+                self.run(job.progress, **job.options)
+                job.status = 'succeeded'
+            except Exception as e:
+                warnings.warn(f"Refresh job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = 'failed'
+            finally:
+                job.finished = time.time()
+                self._queue.task_done()
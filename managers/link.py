@@ -88,17 +88,29 @@ class Link:
     
     
 
-    #grabs new ticker data and updates estimations
-    def update_estimations(self):
-        self.manager.update_estimations()
+    #grabs new ticker data and updates estimations (progress: per-ticker callback, see Manager)
+    def update_estimations(self, progress=None):
+        self.manager.update_estimations(progress=progress)
+
+    #scheduled refresh: stale and widely held tickers first, unchanged ones skipped
+    def refresh_stale(self, progress=None):
+        self.manager.refresh_stale(progress=progress)
+
+    #computes long-term intervals on demand (interval_mode='lazy')
+    def get_intervals(self, ticker: str):
+        return self.manager.compute_long_intervals(ticker)
 
     #adds ticker to watchlist for estimations
     def add_ticker(self, ticker: str):
         self.manager.data.fetch_new_ticker(ticker, auto_update=False)
 
+    #adds many tickers at once (validated in bulk)
+    def add_tickers(self, tickers: list):
+        return self.manager.data.add_tickers(tickers, auto_update=False)
+
     def buy_order(self, name, password, ticker, num_shares: float):
         if self.manager.user_manager.verify_private_key(name, password, True):
-            price = self.manager.data.data.iloc[-1][("Close", ticker)]
+            price = self.manager.data.data[ticker]["Close"].dropna().iloc[-1]
 
             new_data = self.manager.user_manager.buy_order(name, ticker, num_shares, price)
             return new_data
@@ -107,7 +119,7 @@ class Link:
 
     def sell_order(self, name, password, ticker, num_shares: float):
         if self.manager.user_manager.verify_private_key(name, password, True):
-            price = self.manager.data.data.iloc[-1][("Close", ticker)]
+            price = self.manager.data.data[ticker]["Close"].dropna().iloc[-1]
 
             new_data = self.manager.user_manager.sell_order(name, ticker, num_shares, price)
             return new_data
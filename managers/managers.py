@@ -1,13 +1,25 @@
+import copy
+import hashlib
 import warnings
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 import os
 import sys
 
-import yfinance as yf
 from pandas import DataFrame
 import pandas as pd
 
-from estimation.estimation import ShortEstimation, LongEstimation
+from estimation.estimation import ShortEstimation, PooledShortEstimation, LongEstimation, FastLongEstimation
+from estimation.model_registry import ModelRegistry
+from estimation.compute_budget import ComputeBudget
+from estimation.backtest import WalkForwardBacktest
+from estimation.tuning import HyperparameterSearch, load_configs, save_configs, UNIVERSE_KEY
+from managers.prediction_store import PredictionStore
+from managers.history_cache import HistoryCache
+from managers.ttl_cache import TTLCache
+from managers.symbol_index import SymbolIndex
+from managers.fetcher import MarketDataFetcher, ticker_rows, SOURCE_REMOTE, SOURCE_CACHE, SOURCE_DATABASE, SOURCE_MISSING
 from users.user_manager import UserManager
 
 try:
@@ -24,111 +36,227 @@ except ImportError:
 
 
 class DataManager:
-    def __init__(self, db_path='stocks1112.db'):
+    def __init__(self, db_path='stocks1112.db', incremental=False, history_dir=None, metadata_dir=None,
+                 fetcher=None):
         self.data = None
         self.tickers = []
-        self.predictions = self.create_empty_predictions_df()
+        self.sources = {}
+        self.prediction_store = PredictionStore()
         self.db = DatabaseManager(db_path)
         self.use_database = False
+        
+        # Downloaded histories are kept in an on-disk columnar cache when history_dir is set
+        # incremental: only download bars missing from that cache
+        self.incremental = incremental
+        self.history = HistoryCache(history_dir)
+        # Earnings history / ticker info: per-field TTLs, memory + disk (metadata_dir)
+        self.metadata_cache = TTLCache(metadata_dir)
+        # Symbols from the database, loaded on first use and refreshed hourly
+        self.symbol_index = SymbolIndex(lambda: self.query_db(lambda db: db.get_all_tickers()) or [])
+        # fetcher: MarketDataFetcher or a dict of its kwargs (chunk_size, max_workers, rate, ...)
+        self.fetcher = MarketDataFetcher.from_config(fetcher)
+    
+    @property
+    def predictions(self) -> DataFrame:
+        """All predictions as a (Date, Ticker) MultiIndex DataFrame (built lazily from the store)."""
+        return self.prediction_store.frame()
+    
+    @predictions.setter
+    def predictions(self, frame: DataFrame):
+        self.prediction_store.load_frame(frame)
     
     @staticmethod
     def create_empty_predictions_df():
         """Create an empty predictions DataFrame with MultiIndex."""
-        index = pd.MultiIndex(
-            levels=[[], []],
-            codes=[[], []],
-            names=["Date", "Ticker"]
-        )
-        return DataFrame(index=index, columns=['predicted_price', 'predicted_change', 'yhat', 'yhat_lower', 'yhat_upper'])
+        return PredictionStore.empty_frame()
 
     def update_preds(self, ticker, data):
         """
         Update predictions for a ticker.
         Handles both Series and DataFrame input.
         Merges new data with existing predictions instead of overwriting.
+        Only this ticker's arrays are touched, so the cost does not grow
+        with the number of tracked tickers.
         """
-        # Convert Series to DataFrame if needed
-        if isinstance(data, pd.Series):
-            df_temp = pd.DataFrame(data)
-        else:
-            df_temp = data.copy()
-        
-        # Add ticker column
-        df_temp["Ticker"] = ticker
-        df_temp = df_temp.set_index("Ticker", append=True)
-        
-        # Check if this ticker already has predictions
-        existing_tickers = self.predictions.index.get_level_values('Ticker').unique()
-        
-        if ticker in existing_tickers:
-            # Get existing data for this ticker
-            existing_data = self.predictions.xs(ticker, level='Ticker')
-            
-            # Remove old data for this ticker
-            self.predictions = self.predictions.drop(ticker, level='Ticker')
-            
-            # Merge new data with existing data (combine columns, update rows)
-            # Use combine_first to keep existing values where new values are NaN
-            merged = existing_data.combine_first(df_temp.droplevel('Ticker'))
-            
-            # Add ticker back as MultiIndex
-            merged["Ticker"] = ticker
-            merged = merged.set_index("Ticker", append=True)
-            
-            # Concatenate with predictions
-            self.predictions = pd.concat([self.predictions, merged])
-        else:
-            # No existing data, just add it
-            self.predictions = pd.concat([self.predictions, df_temp])
-        
-        # Sort by date
-        self.predictions = self.predictions.sort_index()
+        self.prediction_store.upsert(ticker, data)
 
     def update_data(self):
         """
         Update data for all tracked tickers.
-        Tries yfinance first, falls back to database if rate limited.
+        Downloads from yfinance through the fetcher (chunked, rate limited,
+        retried); only tickers it cannot deliver fall back, one by one, to the
+        local history cache and then the database. Each ticker's source is
+        recorded in self.sources.
         """
         if len(self.tickers) == 0:
             warnings.warn("No tickers are being tracked. Add a ticker using fetch_new_ticker()")
             return
         
+        if self.incremental:
+            frames, sources = self.download_incremental()
+        else:
+            frames, sources = self.fetcher.fetch(self.tickers, fallback=self.load_offline, period="1y")
+            if self.history.store is not None:
+                # Keep a copy on disk so a restart can load it without the network
+                for ticker, source in sources.items():
+                    if source == SOURCE_REMOTE:
+                        self.history.put(ticker, frames[ticker])
+        
+        self.sources = sources
+        if not frames:
+            warnings.warn("No data available from yfinance or database for tracked tickers")
+            return
+        
+        self.data = pd.concat(
+            {ticker: frames[ticker] for ticker in self.tickers if ticker in frames},
+            axis=1, names=['Ticker', 'Price']
+        )
+        self.use_database = SOURCE_DATABASE in sources.values()
+        
+        counts = Counter(source for source in sources.values() if source != SOURCE_MISSING)
+        print(f"✓ Loaded data for {len(frames)} ticker(s): "
+              + ", ".join(f"{n} from {source}" for source, n in counts.items()))
+        missing = [ticker for ticker, source in sources.items() if source == SOURCE_MISSING]
+        if missing:
+            warnings.warn(f"No data available for: {', '.join(missing)}")
+
+    def load_offline(self, tickers: list):
+        """
+        Fallback for tickers yfinance could not deliver: the history cache
+        first, then one bulk database query for the rest.
+        Returns ({ticker: DataFrame}, {ticker: source}) like the fetcher.
+        """
+        frames, sources = {}, {}
+        if self.history.store is not None:
+            for ticker in tickers:
+                cached = self.history.get(ticker)
+                if cached is not None and not cached.empty:
+                    frames[ticker] = cached
+                    sources[ticker] = SOURCE_CACHE
+        
+        rest = [ticker for ticker in tickers if ticker not in frames]
+        wide = self.query_db(lambda db: db.get_tickers_data(rest, period='1y')) if rest else None
+        if wide is not None:
+            for ticker in rest:
+                rows = ticker_rows(wide, ticker)
+                if rows is not None:
+                    frames[ticker] = rows.dropna(how='all')
+                    sources[ticker] = SOURCE_DATABASE
+        return frames, sources
+
+    def query_db(self, query):
+        """
+        Run `query(db)` on a DatabaseManager connected just for this call and
+        closed afterwards. sqlite3 connections can only be used by the thread
+        that opened them, and fallbacks run on request threads and on the
+        refresh job's worker. Returns None if the database cannot be opened.
+        """
+        db = DatabaseManager(self.db.db_path)
+        if not db.connect():
+            return None
         try:
-            self.data = yf.Tickers(tickers=self.tickers)
-            downloaded = self.data.download(period="1y", interval="1d", progress=False)
-            
-            if downloaded.empty:
-                raise Exception("yfinance returned empty data")
-            
-            self.data = downloaded
-            self.use_database = False
-            print("✓ Successfully fetched data from yfinance")
-            
-        except Exception as e:
-            print(f"⚠  yfinance API error: {e}")
-            print("→ Falling back to local database...")
-            
-            if not self.db.connect():
-                warnings.warn("Failed to connect to database. No data available.")
-                return
-            
-            all_data = {}
-            for ticker in self.tickers:
-                ticker_data = self.db.get_ticker_data(ticker, period='1y')
-                
-                if not ticker_data.empty:
-                    ticker_data.columns = pd.MultiIndex.from_product(
-                        [ticker_data.columns, [ticker]]
-                    )
-                    all_data[ticker] = ticker_data
-            
-            if all_data:
-                self.data = pd.concat(all_data.values(), axis=1)
-                self.data.columns = self.data.columns.swaplevel(0, 1)
-                self.use_database = True
-                print(f"✓ Successfully loaded data from database for {len(all_data)} ticker(s)")
+            return query(db)
+        finally:
+            db.close()
+
+    def download_incremental(self):
+        """
+        Download only the bars missing from the history cache.
+        
+        Tickers with cached history are fetched from their delta_start() date
+        (grouped so tickers sharing a start date go in one fetch); new
+        tickers, and tickers whose adjusted history changed because of a
+        split or dividend, get a full period="1y" re-pull. A ticker whose
+        delta fails keeps its cached history.
+        Returns (frames, sources) like MarketDataFetcher.fetch().
+        """
+        full = []
+        by_start = {}
+        for ticker in self.tickers:
+            start = self.history.delta_start(ticker)
+            if start is None:
+                full.append(ticker)
             else:
-                warnings.warn("No data available from database for tracked tickers")
+                by_start.setdefault(start, []).append(ticker)
+        
+        sources = {}
+        for start, group in by_start.items():
+            delta, _ = self.fetcher.fetch(group, start=start)
+            for ticker in group:
+                if ticker not in delta:
+                    sources[ticker] = SOURCE_CACHE
+                elif self.history.append(ticker, delta[ticker]):
+                    sources[ticker] = SOURCE_REMOTE
+                else:
+                    full.append(ticker)
+        n_delta = sum(source == SOURCE_REMOTE for source in sources.values())
+        
+        downloaded = {}
+        if full:
+            downloaded, full_sources = self.fetcher.fetch(full, fallback=self.load_offline, period="1y")
+            for ticker, source in full_sources.items():
+                if source == SOURCE_REMOTE:
+                    self.history.put(ticker, downloaded[ticker])
+            sources.update(full_sources)
+        
+        frames = {}
+        for ticker in self.tickers:
+            if sources.get(ticker) in (SOURCE_DATABASE, SOURCE_MISSING):
+                if ticker in downloaded:
+                    frames[ticker] = downloaded[ticker]
+                continue
+            history = self.history.get(ticker)
+            if history is not None and not history.empty:
+                frames[ticker] = history
+        
+        print(f"✓ Incremental update: {n_delta} delta, {len(full)} full download(s)")
+        return frames, sources
+
+    def validate_remote(self, ticker: str) -> bool:
+        """Check a symbol against yfinance (.info, via the TTL cache); known symbols are added to the index."""
+        try:
+            import yfinance as yf
+            ticker_info = self.metadata_cache.get_or_fetch('info', ticker, lambda: yf.Ticker(ticker).info)
+        except Exception:
+            return False
+        if ticker_info is None or len(ticker_info) <= 1:
+            return False
+        self.symbol_index.add([ticker])
+        return True
+
+    def add_tickers(self, tickers: list, auto_update=True, max_workers=8) -> dict:
+        """
+        Add many tickers to the tracking list at once.
+        
+        Symbols in the symbol index are accepted without a network call; the
+        rest are validated against yfinance concurrently, in one batch.
+        update_data() runs once at the end when auto_update is set.
+        Returns {'added': [...], 'invalid': [...], 'already_tracked': [...]}.
+        """
+        requested = list(dict.fromkeys(str(ticker).upper() for ticker in tickers))
+        already_tracked = [ticker for ticker in requested if ticker in self.tickers]
+        new = [ticker for ticker in requested if ticker not in self.tickers]
+        
+        known = {ticker for ticker in new if ticker in self.symbol_index}
+        unknown = [ticker for ticker in new if ticker not in known]
+        if unknown:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(unknown))) as pool:
+                remote_valid = list(pool.map(self.validate_remote, unknown))
+            known.update(ticker for ticker, valid in zip(unknown, remote_valid) if valid)
+        
+        added = [ticker for ticker in new if ticker in known]
+        invalid = [ticker for ticker in new if ticker not in known]
+        self.tickers.extend(added)
+        
+        print(f"✓ Added {len(added)} ticker(s) ({len(new) - len(unknown)} from index, "
+              f"{len(unknown)} checked remotely)")
+        if invalid:
+            warnings.warn(f"Tickers not found in yfinance or database: {', '.join(invalid)}")
+        
+        if auto_update and added:
+            self.update_data()
+        
+        return {'added': added, 'invalid': invalid, 'already_tracked': already_tracked}
 
     def fetch_new_ticker(self, ticker: str, auto_update=True):
         """Add a new ticker to tracking list."""
@@ -138,19 +266,12 @@ class DataManager:
             warnings.warn(f"Already tracking ticker {ticker}")
             return None
         
-        ticker_valid = False
-        
-        try:
-            ticker_info = yf.Ticker(ticker).info
-            if len(ticker_info) > 1:
-                ticker_valid = True
-        except:
-            pass
-        
-        if not ticker_valid:
-            if self.db.ticker_exists(ticker):
-                ticker_valid = True
-                print(f"✓ Ticker {ticker} found in database")
+        # Known symbols are a set lookup; only unknown ones go to yfinance
+        ticker_valid = ticker in self.symbol_index
+        if ticker_valid:
+            print(f"✓ Ticker {ticker} found in database")
+        else:
+            ticker_valid = self.validate_remote(ticker)
         
         if not ticker_valid:
             warnings.warn(f"Ticker {ticker} not found in yfinance or database")
@@ -164,6 +285,22 @@ class DataManager:
         
         return None
 
+    def input_fingerprint(self, ticker: str):
+        """Hash of the price bars loaded for `ticker` (None when it has no data)."""
+        if self.data is None:
+            return None
+        if isinstance(self.data.columns, pd.MultiIndex):
+            if ticker not in self.data.columns.get_level_values(0):
+                return None
+            bars = self.data[ticker]
+        else:
+            bars = self.data
+        bars = bars.dropna(how='all')
+        if bars.empty:
+            return None
+        hashed = pd.util.hash_pandas_object(bars, index=True).to_numpy()
+        return hashlib.sha1(hashed.tobytes() + ','.join(map(str, bars.columns)).encode()).hexdigest()
+
     def get_ticker_data(self, ticker: str) -> DataFrame:
         """Get data for specific ticker with additional earnings info."""
         ticker = ticker.upper()
@@ -186,11 +323,18 @@ class DataManager:
             
             print(f"✓ Prepared ticker data for {ticker}: {len(main_data)} rows")
             
+            # Earnings are looked up for yfinance tickers, whether the bars were
+            # just downloaded or served from the local history cache
             new_data = None
-            if not self.use_database:
+            source = self.sources.get(ticker, SOURCE_DATABASE if self.use_database else SOURCE_REMOTE)
+            if source not in (SOURCE_DATABASE, SOURCE_MISSING):
                 try:
-                    new_data = yf.Ticker(ticker).get_earnings_history()
-                    if not new_data.empty:
+                    import yfinance as yf
+                    # Changes once a quarter, so it is served from the TTL cache between refreshes
+                    new_data = self.metadata_cache.get_or_fetch(
+                        'earnings_history', ticker, lambda: yf.Ticker(ticker).get_earnings_history()
+                    )
+                    if new_data is not None and not new_data.empty:
                         new_data = new_data.sort_index().reset_index().rename(columns={'index': 'quarter'})
                 except:
                     pass
@@ -217,24 +361,127 @@ class DataManager:
             return DataFrame()
 
 
+def _no_progress(ticker, event, error=None):
+    pass
+
+
+def _estimate_ticker(short_est: ShortEstimation, long_est: LongEstimation, ticker: str, ticker_data: DataFrame):
+    """
+    Process-pool worker for Manager.update_estimations(parallel_estimations=True).
+    
+    Returns (short_pred, short_error, long_pred, long_error, state); errors are
+    returned rather than raised so the short-term result survives a failed
+    long-term fit, and `state` carries the worker's estimator state back.
+    """
+    short_pred = long_pred = short_error = long_error = None
+    try:
+        short_pred, _ = short_est.estimate(ticker_data, ticker=ticker)
+    except Exception as e:
+        short_error = e
+    
+    if short_error is None:
+        try:
+            long_pred = long_est.estimate(ticker_data, ticker=ticker)
+        except Exception as e:
+            long_error = e
+    
+    state = {
+        'fit_state': short_est.fit_state.get(ticker),
+        'long_model': long_est.models.get(ticker),
+        'registry_hits': short_est.registry.hits if short_est.registry is not None else 0,
+        'registry_misses': short_est.registry.misses if short_est.registry is not None else 0,
+    }
+    return short_pred, short_error, long_pred, long_error, state
+
+
 class Manager:
     
-    def __init__(self, db_path='stocks1112.db'):
-        self.data: DataManager = DataManager(db_path)
-        self.short_est: ShortEstimation = ShortEstimation()
-        self.long_est: LongEstimation = LongEstimation()
+    def __init__(self, db_path='stocks1112.db', model_cache_dir='model_cache', incremental_training=False,
+                 pooled_short=False, short_strategy='recursive', tuned_params_path=None, compute_budget=None,
+                 parallel_long=False, long_engine='prophet', long_interval_mode='sampled', incremental_data=False,
+                 fetch_config=None, parallel_estimations=False, io_workers=8):
+        # incremental_data: keep a local price history and only download the missing bars
+        self.data: DataManager = DataManager(
+            db_path,
+            incremental=incremental_data,
+            history_dir=os.path.join(model_cache_dir, 'history') if model_cache_dir else None,
+            metadata_dir=os.path.join(model_cache_dir, 'metadata') if model_cache_dir else None,
+            # fetch_config: {"chunk_size", "max_workers", "rate", "burst", "max_retries", ...}
+            fetcher=fetch_config
+        )
+        
+        # compute_budget: {"total_cores", "workers", "threads_per_worker"} for parallel work
+        self.compute_budget: ComputeBudget = ComputeBudget.from_config(compute_budget)
+        self.model_registry: ModelRegistry = ModelRegistry(model_cache_dir)
+        
+        # Configs saved by tune_short() (window_size + LightGBM params): the
+        # universe entry sets the defaults, ticker entries override them per ticker
+        configs = load_configs(tuned_params_path) if tuned_params_path else {}
+        tuned = configs.get(UNIVERSE_KEY)
+        ticker_configs = {ticker: config for ticker, config in configs.items() if ticker != UNIVERSE_KEY}
+        short_kwargs = {'window_size': tuned['window_size']} if tuned else {}
+        # LightGBM threads: each pool worker's share when fits run in the
+        # process pool, every budgeted core when they run inline
+        if parallel_estimations:
+            lgbm_threads = self.compute_budget.lgbm_params()
+        else:
+            lgbm_threads = {'n_jobs': self.compute_budget.total_cores}
+        short_kwargs['params'] = {**(tuned['params'] if tuned else {}), **lgbm_threads}
+        
+        # pooled_short: one cross-sectional model for all tickers instead of one per ticker
+        if pooled_short:
+            if short_strategy != 'recursive':
+                warnings.warn(f"short_strategy={short_strategy!r} is not supported with pooled_short; "
+                              "the pooled model always forecasts recursively")
+            if ticker_configs:
+                warnings.warn(f"Ignoring {len(ticker_configs)} per-ticker tuned configs: "
+                              "the pooled model shares one config across tickers")
+            self.short_est: ShortEstimation = PooledShortEstimation(registry=self.model_registry, **short_kwargs)
+        else:
+            self.short_est: ShortEstimation = ShortEstimation(
+                registry=self.model_registry,
+                incremental=incremental_training,
+                strategy=short_strategy,
+                ticker_configs=ticker_configs,
+                **short_kwargs
+            )
+        # long_engine: 'prophet' or 'fast' (batched NumPy trend + Fourier least squares)
+        if long_engine == 'fast':
+            self.long_est: LongEstimation = FastLongEstimation()
+        else:
+            self.long_est: LongEstimation = LongEstimation(
+                cache_dir=os.path.join(model_cache_dir, 'prophet') if model_cache_dir else None,
+                interval_mode=long_interval_mode
+            )
+        self.parallel_long: bool = parallel_long
+        # parallel_estimations: pipeline data prep (io_workers threads) into per-ticker
+        # short + long fits on the compute budget's process pool
+        self.parallel_estimations: bool = parallel_estimations
+        self.io_workers: int = io_workers
         self.user_manager: UserManager = UserManager()
         
         self.current_date: datetime = datetime.now()
         self.last_estimation: datetime = None
+        # Per ticker: when its estimate last succeeded, and the input_fingerprint() it used
+        self.estimated_at: dict = {}
+        self.input_fingerprints: dict = {}
     
-    def update_estimations(self, reset=False):
+    def update_estimations(self, reset=False, progress=None, tickers=None, skip_unchanged=False):
         """
         Update predictions for all tracked tickers.
         FIXED: Properly merges short-term and long-term predictions.
+        
+        progress: optional callable(ticker, event, error=None), called with
+                  'started' when a ticker's estimation begins and 'done' or
+                  'failed' when it ends, or 'skipped' (used by background refresh jobs)
+        tickers: estimate only these tracked tickers, in this order (default all)
+        skip_unchanged: skip tickers that already have predictions made from
+                        the same price bars (compared by input_fingerprint())
         """
+        progress = progress or _no_progress
         if reset:
-            self.data.predictions = self.data.create_empty_predictions_df()
+            self.data.prediction_store.clear()
+            self.input_fingerprints.clear()
         
         self.data.update_data()
         
@@ -242,37 +489,133 @@ class Manager:
             warnings.warn("No data available to generate estimations")
             return self.data.predictions
         
-        for ticker in self.data.tickers:
+        tickers = [ticker for ticker in (tickers or self.data.tickers) if ticker in self.data.tickers]
+        fingerprints = {ticker: self.data.input_fingerprint(ticker) for ticker in tickers}
+        if skip_unchanged:
+            changed = []
+            for ticker in tickers:
+                if (fingerprints[ticker] is not None
+                        and self.input_fingerprints.get(ticker) == fingerprints[ticker]
+                        and self.data.prediction_store.counts(ticker)['predicted_price'] > 0):
+                    progress(ticker, 'skipped')
+                else:
+                    changed.append(ticker)
+            print(f"✓ Skipping {len(tickers) - len(changed)} ticker(s) with unchanged data")
+            tickers = changed
+        
+        def record(ticker, event, error=None):
+            if event == 'done':
+                self.estimated_at[ticker] = datetime.now()
+                self.input_fingerprints[ticker] = fingerprints.get(ticker)
+            progress(ticker, event, error)
+        
+        if isinstance(self.short_est, PooledShortEstimation):
+            if self.parallel_estimations:
+                warnings.warn("parallel_estimations needs per-ticker short models; running pooled estimation sequentially")
+            # The pooled model is always trained on the whole universe; skipped
+            # or unselected tickers only contribute training rows
+            context = [ticker for ticker in self.data.tickers if ticker not in tickers]
+            self._update_sequential(tickers, record, context=context)
+        elif self.parallel_estimations:
+            self._update_parallel(tickers, record)
+        else:
+            self._update_sequential(tickers, record)
+        
+        self.last_estimation = datetime.now()
+        
+        cache_stats = self.model_registry.stats()
+        print(f"✓ Model cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        
+        if self.data.use_database:
+            self.data.db.close()
+        
+        return self.data.predictions
+
+    def _update_sequential(self, tickers, progress, context=()):
+        """
+        Prepare all tickers, run the short-term batch, then stream long-term fits.
+        
+        context: extra tickers whose data goes into the short-term batch (to
+                 train a pooled model) but which are not forecast or merged
+        """
+        # Prepare data for every ticker first so the short-term rollout can
+        # advance all tickers together
+        frames = {}
+        for ticker in tickers:
+            progress(ticker, 'started')
             try:
                 ticker_data = self.data.get_ticker_data(ticker)
                 
                 if ticker_data.empty:
                     warnings.warn(f"No data available for {ticker}, skipping estimation")
+                    progress(ticker, 'failed', ValueError("No data available"))
                     continue
                 
-                # SHORT-TERM ESTIMATION
-                pred_price, real_price = self.short_est.estimate(ticker_data)
+                frames[ticker] = ticker_data
+                
+            except Exception as e:
+                warnings.warn(f"Failed to generate predictions for {ticker}: {e}")
+                progress(ticker, 'failed', e)
+                import traceback
+                traceback.print_exc()
+                continue
+        
+        if not frames:
+            return
+        
+        extra = {}
+        for ticker in context:
+            try:
+                ticker_data = self.data.get_ticker_data(ticker)
+                if not ticker_data.empty:
+                    extra[ticker] = ticker_data
+            except Exception as e:
+                warnings.warn(f"Failed to prepare training data for {ticker}: {e}")
+        
+        # SHORT-TERM ESTIMATION (lock-step across tickers)
+        short_preds, short_errors = self.short_est.estimate_batch({**frames, **extra})
+        
+        long_frames = {}
+        for ticker, ticker_data in frames.items():
+            try:
+                if ticker in short_errors:
+                    raise short_errors[ticker]
+                
+                pred_price = short_preds[ticker]
                 
                 # Add short-term predictions first
                 self.data.update_preds(ticker, pred_price)
                 
                 # Verify short-term data was added
-                ticker_preds = self.data.predictions.xs(ticker, level='Ticker')
-                short_count = ticker_preds['predicted_price'].notna().sum()
+                short_count = self.data.prediction_store.counts(ticker)['predicted_price']
                 
                 if short_count == 0:
                     warnings.warn(f"No short-term predictions generated for {ticker}")
                 
-                # LONG-TERM ESTIMATION
-                long_pred = self.long_est.estimate(ticker_data)
+                long_frames[ticker] = ticker_data
+                
+            except Exception as e:
+                warnings.warn(f"Failed to generate predictions for {ticker}: {e}")
+                progress(ticker, 'failed', e)
+                import traceback
+                traceback.print_exc()
+                continue
+        
+        # LONG-TERM ESTIMATION (streamed back as each ticker finishes;
+        # fanned out to a process pool when parallel_long is set)
+        budget = self.compute_budget if self.parallel_long else None
+        for ticker, long_pred, error in self.long_est.estimate_stream(long_frames, budget):
+            try:
+                if error is not None:
+                    raise error
                 
                 # Add long-term predictions (will merge with existing)
                 self.data.update_preds(ticker, long_pred)
                 
                 # Verify both are present
-                ticker_preds = self.data.predictions.xs(ticker, level='Ticker')
-                short_count = ticker_preds['predicted_price'].notna().sum()
-                long_count = ticker_preds['yhat'].notna().sum()
+                counts = self.data.prediction_store.counts(ticker)
+                short_count = counts['predicted_price']
+                long_count = counts['yhat']
                 
                 if short_count == 0:
                     warnings.warn(f"predicted_price was lost during merge for {ticker}")
@@ -281,16 +624,207 @@ class Manager:
                     warnings.warn(f"No long-term predictions generated for {ticker}")
                 
                 print(f"✓ Generated predictions for {ticker}")
+                progress(ticker, 'done')
                 
             except Exception as e:
                 warnings.warn(f"Failed to generate predictions for {ticker}: {e}")
+                progress(ticker, 'failed', e)
                 import traceback
                 traceback.print_exc()
                 continue
+
+    def _worker_estimators(self, ticker: str):
+        """
+        Lightweight copies of the estimators to send to a worker process:
+        only this ticker's incremental state, no previously fitted models,
+        and a registry that shares the disk cache but not the memory LRU.
+        """
+        short_est = copy.copy(self.short_est)
+        short_est.model = None
+        short_est.direct_model = None
+        short_est.fit_state = {ticker: self.short_est.fit_state[ticker]} if ticker in self.short_est.fit_state else {}
+        short_est.ticker_configs = {ticker: self.short_est.ticker_configs[ticker]} if ticker in self.short_est.ticker_configs else {}
+        if short_est.registry is not None:
+            short_est.registry = short_est.registry.worker_copy()
         
-        self.last_estimation = datetime.now()
+        long_est = copy.copy(self.long_est)
+        long_est.models = {}
+        return short_est, long_est
+
+    def _update_parallel(self, tickers, progress):
+        """
+        Pipelined per-ticker estimation.
         
-        if self.data.use_database:
-            self.data.db.close()
+        get_ticker_data (I/O bound: earnings lookups) runs on a thread pool;
+        as each ticker's data is ready, its short- and long-term fits are
+        submitted to the compute budget's process pool, and results are
+        merged into the prediction store as each ticker finishes.
+        """
+        with ThreadPoolExecutor(max_workers=self.io_workers) as io_pool, self.compute_budget.executor() as pool:
+            futures = {}
+            for ticker in tickers:
+                progress(ticker, 'started')
+                futures[io_pool.submit(self.data.get_ticker_data, ticker)] = ('prepare', ticker)
+            
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, ticker = futures.pop(future)
+                    try:
+                        if stage == 'prepare':
+                            ticker_data = future.result()
+                            if ticker_data.empty:
+                                warnings.warn(f"No data available for {ticker}, skipping estimation")
+                                progress(ticker, 'failed', ValueError("No data available"))
+                                continue
+                            short_est, long_est = self._worker_estimators(ticker)
+                            futures[pool.submit(_estimate_ticker, short_est, long_est, ticker, ticker_data)] = ('fit', ticker)
+                        else:
+                            self._merge_worker_result(ticker, *future.result())
+                            progress(ticker, 'done')
+                    
+                    except Exception as e:
+                        warnings.warn(f"Failed to generate predictions for {ticker}: {e}")
+                        progress(ticker, 'failed', e)
+                        import traceback
+                        traceback.print_exc()
+                        continue
+
+    def _merge_worker_result(self, ticker: str, short_pred, short_error, long_pred, long_error, state: dict):
+        """Merge one _estimate_ticker() result into the store and the parent's estimator state."""
+        if state.get('fit_state') is not None:
+            self.short_est.keep_fit_state(ticker, state['fit_state'])
+        if state.get('long_model') is not None:
+            self.long_est.models[ticker] = state['long_model']
+        self.model_registry.hits += state.get('registry_hits', 0)
+        self.model_registry.misses += state.get('registry_misses', 0)
+        
+        if short_error is not None:
+            raise short_error
+        
+        self.data.update_preds(ticker, short_pred)
+        if self.data.prediction_store.counts(ticker)['predicted_price'] == 0:
+            warnings.warn(f"No short-term predictions generated for {ticker}")
+        
+        if long_error is not None:
+            raise long_error
+        
+        self.data.update_preds(ticker, long_pred)
+        counts = self.data.prediction_store.counts(ticker)
+        if counts['predicted_price'] == 0:
+            warnings.warn(f"predicted_price was lost during merge for {ticker}")
+        if counts['yhat'] == 0:
+            warnings.warn(f"No long-term predictions generated for {ticker}")
+        
+        print(f"✓ Generated predictions for {ticker}")
+
+    def refresh_order(self, tickers=None, now: datetime = None) -> list:
+        """
+        Tickers ordered by refresh priority, most urgent first.
+        
+        Never-estimated tickers come first; the rest are ranked by hours since
+        their last estimate weighted by (1 + number of user positions holding
+        them), so widely held tickers refresh ahead of equally stale ones.
+        """
+        now = now or datetime.now()
+        tickers = list(tickers or self.data.tickers)
+        holders = Counter(
+            str(ticker).upper()
+            for user in self.user_manager.users.values()
+            for ticker in user.positions
+        )
+        
+        def priority(ticker):
+            weight = 1 + holders[ticker]
+            if ticker not in self.estimated_at:
+                return (1, weight)
+            stale_hours = (now - self.estimated_at[ticker]).total_seconds() / 3600
+            return (0, stale_hours * weight)
+        
+        return sorted(tickers, key=priority, reverse=True)
+
+    def refresh_stale(self, progress=None):
+        """Scheduled refresh: every tracked ticker in refresh_order(), skipping unchanged inputs."""
+        return self.update_estimations(progress=progress, tickers=self.refresh_order(), skip_unchanged=True)
+
+    def compute_long_intervals(self, ticker: str):
+        """
+        Fill in yhat_lower/yhat_upper for a ticker whose long-term estimate
+        was made with interval_mode='lazy'.
+        """
+        ticker = ticker.upper()
+        intervals = self.long_est.compute_intervals(ticker)
+        self.data.update_preds(ticker, intervals)
+        return intervals
+
+    def tune_short(self, path='tuned_params.json', per_ticker=False, **kwargs):
+        """
+        Search window_size and LightGBM params for the short-term model on all
+        tracked tickers and save the best config(s) to `path`.
+        kwargs are passed to HyperparameterSearch.
+        """
+        if self.data.data is None:
+            self.data.update_data()
+        
+        frames = {}
+        for ticker in self.data.tickers:
+            ticker_data = self.data.get_ticker_data(ticker)
+            if not ticker_data.empty:
+                frames[ticker] = ticker_data
+        
+        kwargs.setdefault('budget', self.compute_budget)
+        search = HyperparameterSearch(**kwargs)
+        if per_ticker:
+            configs = search.search_per_ticker(frames)
+        else:
+            configs = {UNIVERSE_KEY: search.search(frames)}
+        
+        save_configs(configs, path)
+        return configs
+
+    def _backtest_estimators(self, budget: ComputeBudget):
+        """
+        Copies of the configured estimators (tuned params, short_strategy,
+        pooled_short, long_engine) for backtesting: no model registry, so fold
+        models do not fill the cache, no incremental state, and LightGBM
+        limited to the budget's thread share.
+        """
+        short_est = copy.copy(self.short_est)
+        short_est.registry = None
+        short_est.incremental = False
+        short_est.fit_state = {}
+        short_est.model = None
+        short_est.direct_model = None
+        short_est.params = {**self.short_est.params, **budget.lgbm_params(), 'verbose': -1}
+        
+        long_est = copy.copy(self.long_est)
+        long_est.models = {}
+        return short_est, long_est
+
+    def backtest(self, db_path=None, **kwargs):
+        """
+        Walk-forward backtest of the short- and long-term estimators on all
+        tracked tickers. kwargs are passed to WalkForwardBacktest; by default
+        it evaluates copies of this manager's estimators (see _backtest_estimators).
+        Results are appended to the `backtest_results` table when db_path is set.
+        """
+        if self.data.data is None:
+            self.data.update_data()
+        
+        frames = {}
+        for ticker in self.data.tickers:
+            ticker_data = self.data.get_ticker_data(ticker)
+            if not ticker_data.empty:
+                frames[ticker] = ticker_data
+        
+        kwargs.setdefault('budget', self.compute_budget)
+        if 'short_est' not in kwargs or 'long_est' not in kwargs:
+            short_est, long_est = self._backtest_estimators(kwargs['budget'])
+            kwargs.setdefault('short_est', short_est)
+            kwargs.setdefault('long_est', long_est)
+        results = WalkForwardBacktest(**kwargs).run(frames)
+        
+        if db_path is not None:
+            WalkForwardBacktest.save(results, db_path)
         
-        return self.data.predictions
\ No newline at end of file
+        return results
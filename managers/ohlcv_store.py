@@ -0,0 +1,97 @@
+import json
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+class OHLCVStore:
+    """
+    On-disk columnar cache of daily price history, one file per ticker.
+
+    Each ticker is a float64 .npy matrix of shape (1 + n_fields, n_rows): row 0
+    holds the bar timestamps (epoch seconds) and every other row is one field
+    (Open, High, Low, Close, ...), so each column is a contiguous array. Field
+    names live in a small JSON sidecar. read() memory-maps the matrix and
+    wraps it in a DataFrame without copying, so loading a ticker only touches
+    the pages that are actually used and no network or SQLite is needed.
+    """
+
+    def __init__(self, cache_dir: str = 'model_cache/history'):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, ticker: str, ext: str) -> str:
+        return os.path.join(self.cache_dir, f"{ticker}.{ext}")
+
+    def __contains__(self, ticker) -> bool:
+        return os.path.exists(self._path(ticker, 'npy')) and os.path.exists(self._path(ticker, 'json'))
+
+    def tickers(self) -> list:
+        """Tickers with a cached history on disk."""
+        return sorted(name[:-4] for name in os.listdir(self.cache_dir)
+                      if name.endswith('.npy') and name[:-4] in self)
+
+    def write(self, ticker: str, history: DataFrame):
+        """Store `history` (DatetimeIndex, numeric columns) for `ticker`."""
+        index = pd.DatetimeIndex(history.index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+
+        fields = [str(col) for col in history.columns]
+        matrix = np.empty((1 + len(fields), len(history)), dtype=np.float64)
+        matrix[0] = index.values.astype('datetime64[s]').astype(np.int64)
+        for i, col in enumerate(history.columns, start=1):
+            matrix[i] = pd.to_numeric(history[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+
+        try:
+            # Sidecar first: read() checks its row/field counts against the matrix
+            tmp_path = self._path(ticker, 'json') + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump({'fields': fields, 'rows': len(history)}, f)
+            os.replace(tmp_path, self._path(ticker, 'json'))
+
+            tmp_path = self._path(ticker, 'npy') + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, matrix)
+            os.replace(tmp_path, self._path(ticker, 'npy'))
+        except Exception as e:
+            warnings.warn(f"Failed to save history for {ticker}: {e}")
+
+    def arrays(self, ticker: str, mmap: bool = True):
+        """
+        (dates, matrix, fields) for `ticker`, or None if not cached.
+
+        `matrix` is the (n_fields, n_rows) float64 block, memory-mapped and
+        read-only when mmap=True.
+        """
+        if ticker not in self:
+            return None
+        try:
+            with open(self._path(ticker, 'json'), 'r') as f:
+                meta = json.load(f)
+            data = np.load(self._path(ticker, 'npy'), mmap_mode='r' if mmap else None)
+        except Exception as e:
+            warnings.warn(f"Failed to load cached history for {ticker}: {e}")
+            return None
+
+        if data.shape != (1 + len(meta['fields']), meta['rows']):
+            # Interrupted write: sidecar and matrix disagree
+            return None
+        dates = data[0].astype(np.int64).astype('datetime64[s]').astype('datetime64[ns]')
+        return dates, data[1:], meta['fields']
+
+    def read(self, ticker: str, mmap: bool = True):
+        """History for `ticker` as a DataFrame (a zero-copy view when mmap=True), or None."""
+        loaded = self.arrays(ticker, mmap=mmap)
+        if loaded is None:
+            return None
+        dates, matrix, fields = loaded
+        return DataFrame(matrix.T, index=pd.DatetimeIndex(dates, name='Date'), columns=fields, copy=False)
+
+    def remove(self, ticker: str):
+        for ext in ('npy', 'json'):
+            if os.path.exists(self._path(ticker, ext)):
+                os.remove(self._path(ticker, ext))
@@ -0,0 +1,147 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+
+
+class PredictionStore:
+    """
+    Per-ticker columnar store for predictions.
+
+    Each ticker owns a sorted datetime64 array of dates and a float64
+    (n_dates, len(COLUMNS)) value matrix, so an upsert only touches that
+    ticker's arrays and does not depend on how many tickers are stored.
+    The MultiIndex (Date, Ticker) DataFrame used by existing callers is built
+    lazily by frame() and cached until the next write.
+    """
+
+    COLUMNS = ['predicted_price', 'predicted_change', 'yhat', 'yhat_lower', 'yhat_upper']
+
+    def __init__(self):
+        self.dates = {}
+        self.values = {}
+        self._frame = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def empty_frame(cls) -> DataFrame:
+        """Empty predictions DataFrame with the (Date, Ticker) MultiIndex."""
+        index = pd.MultiIndex(
+            levels=[[], []],
+            codes=[[], []],
+            names=["Date", "Ticker"]
+        )
+        return DataFrame(index=index, columns=cls.COLUMNS)
+
+    def tickers(self) -> list:
+        return list(self.dates)
+
+    def __contains__(self, ticker) -> bool:
+        return ticker in self.dates
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def upsert(self, ticker: str, data):
+        """
+        Merge predictions for one ticker (Series or DataFrame indexed by date).
+
+        Same semantics as the old DataManager.update_preds: existing values are
+        kept, and NaN cells and new dates are filled from `data`. Columns not
+        in COLUMNS are ignored.
+        """
+        if isinstance(data, pd.Series):
+            data = data.to_frame()
+
+        new_dates = pd.DatetimeIndex(pd.to_datetime(data.index)).values.astype('datetime64[ns]')
+        new_values = np.full((len(data), len(self.COLUMNS)), np.nan)
+        for j, col in enumerate(self.COLUMNS):
+            if col in data.columns:
+                new_values[:, j] = pd.to_numeric(data[col], errors='coerce').values
+
+        order = np.argsort(new_dates, kind='stable')
+        new_dates, new_values = new_dates[order], new_values[order]
+
+        with self._lock:
+            if ticker not in self.dates:
+                # Duplicate dates in the input: keep the first, like combine_first on a unique index
+                new_dates, first = np.unique(new_dates, return_index=True)
+                self.dates[ticker] = new_dates
+                self.values[ticker] = new_values[first]
+            else:
+                old_dates, old_values = self.dates[ticker], self.values[ticker]
+                dates = np.union1d(old_dates, new_dates)
+                values = np.full((len(dates), len(self.COLUMNS)), np.nan)
+
+                # Later writes only fill cells the earlier ones left empty
+                new_pos = np.searchsorted(dates, new_dates)
+                values[new_pos[::-1]] = new_values[::-1]
+                old_pos = np.searchsorted(dates, old_dates)
+                kept = values[old_pos]
+                values[old_pos] = np.where(np.isnan(old_values), kept, old_values)
+
+                self.dates[ticker] = dates
+                self.values[ticker] = values
+
+            self._frame = None
+
+    def remove(self, ticker: str):
+        with self._lock:
+            self.dates.pop(ticker, None)
+            self.values.pop(ticker, None)
+            self._frame = None
+
+    def clear(self):
+        with self._lock:
+            self.dates.clear()
+            self.values.clear()
+            self._frame = None
+
+    def get(self, ticker: str) -> DataFrame:
+        """Predictions of one ticker, indexed by Date (empty frame if unknown)."""
+        with self._lock:
+            if ticker not in self.dates:
+                return DataFrame(columns=self.COLUMNS, index=pd.DatetimeIndex([], name="Date"))
+            return DataFrame(
+                self.values[ticker].copy(),
+                index=pd.DatetimeIndex(self.dates[ticker], name="Date"),
+                columns=self.COLUMNS,
+            )
+
+    def counts(self, ticker: str) -> dict:
+        """Number of non-NaN values per column for one ticker."""
+        with self._lock:
+            if ticker not in self.values:
+                return dict.fromkeys(self.COLUMNS, 0)
+            filled = (~np.isnan(self.values[ticker])).sum(axis=0)
+            return dict(zip(self.COLUMNS, filled.tolist()))
+
+    def frame(self) -> DataFrame:
+        """(Date, Ticker) MultiIndex DataFrame of all predictions, cached until the next write."""
+        with self._lock:
+            if self._frame is None:
+                if not self.dates:
+                    self._frame = self.empty_frame()
+                else:
+                    tickers = list(self.dates)
+                    lengths = [len(self.dates[t]) for t in tickers]
+                    index = pd.MultiIndex.from_arrays(
+                        [
+                            pd.DatetimeIndex(np.concatenate([self.dates[t] for t in tickers])),
+                            np.repeat(tickers, lengths),
+                        ],
+                        names=["Date", "Ticker"],
+                    )
+                    values = np.vstack([self.values[t] for t in tickers])
+                    self._frame = DataFrame(values, index=index, columns=self.COLUMNS).sort_index()
+            return self._frame
+
+    def load_frame(self, frame: DataFrame):
+        """Replace the store contents with a (Date, Ticker) predictions DataFrame."""
+        with self._lock:
+            self.clear()
+            if frame is None or frame.empty:
+                return
+            for ticker, ticker_data in frame.groupby(level='Ticker'):
+                self.upsert(ticker, ticker_data.droplevel('Ticker'))
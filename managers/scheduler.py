@@ -0,0 +1,121 @@
+import threading
+import warnings
+from datetime import datetime, timedelta
+
+
+class RefreshScheduler:
+    """
+    Calls `trigger` on a fixed cadence from a background thread.
+
+    The cadence is either every `interval` seconds, or daily at `times`
+    ("HH:MM", server local time; the default is shortly after the US market
+    close), optionally on weekdays only. The scheduler only decides when a
+    refresh runs: `trigger` starts it (api_server submits a refresh job, which
+    orders tickers by priority and skips unchanged ones).
+    """
+
+    DEFAULT_TIMES = ('16:30',)
+
+    def __init__(self, trigger, interval: float = None, times=None, weekdays_only: bool = True,
+                 clock=datetime.now):
+        """
+        trigger: callable run at each scheduled time; its return value is kept in last_result
+        interval: seconds between runs (takes precedence over `times`)
+        times: daily run times as "HH:MM" strings (default DEFAULT_TIMES)
+        weekdays_only: skip Saturdays and Sundays for daily times
+        clock: returns the current datetime (injectable for tests)
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be positive")
+        self.trigger = trigger
+        self.interval = interval
+        self.times = sorted(self._parse_time(t) for t in (times or self.DEFAULT_TIMES))
+        self.weekdays_only = weekdays_only
+        self.clock = clock
+        self.next_run = None
+        self.last_run = None
+        self.last_result = None
+        self.last_error = None
+        self.runs = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, trigger, config=None) -> "RefreshScheduler":
+        """Build from a dict of constructor kwargs (None = defaults)."""
+        return cls(trigger, **(config or {}))
+
+    @staticmethod
+    def _parse_time(value: str):
+        hour, minute = (int(part) for part in str(value).split(':'))
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError(f"Invalid time of day: {value}")
+        return hour, minute
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First scheduled run strictly after `moment`."""
+        if self.interval is not None:
+            return moment + timedelta(seconds=self.interval)
+
+        day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        # A week ahead always contains a weekday
+        for _ in range(8):
+            if not (self.weekdays_only and day.weekday() >= 5):
+                for hour, minute in self.times:
+                    candidate = day.replace(hour=hour, minute=minute)
+                    if candidate > moment:
+                        return candidate
+            day += timedelta(days=1)
+        raise RuntimeError("No scheduled time found")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background thread (no-op if already running)."""
+        if self.running:
+            return
+        self._stop.clear()
+        self.next_run = self.next_after(self.clock())
+        self._thread = threading.Thread(target=self._loop, name='refresh-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def run_now(self):
+        """Run the trigger immediately (outside the cadence) and record the result."""
+        self.last_run = self.clock()
+        self.runs += 1
+        try:
+            self.last_result = self.trigger()
+            self.last_error = None
+        except Exception as e:
+            warnings.warn(f"Scheduled refresh failed: {e}")
+            self.last_error = str(e)
+        return self.last_result
+
+    def _loop(self):
+        while True:
+            wait = (self.next_run - self.clock()).total_seconds()
+            # Wake at least once a minute so clock changes (sleep, DST) are picked up
+            if self._stop.wait(min(max(wait, 0), 60)):
+                return
+            if self.clock() >= self.next_run:
+                self.run_now()
+                self.next_run = self.next_after(max(self.clock(), self.next_run))
+
+    def status(self) -> dict:
+        return {
+            'running': self.running,
+            'interval': self.interval,
+            'times': [f"{hour:02d}:{minute:02d}" for hour, minute in self.times] if self.interval is None else None,
+            'weekdays_only': self.weekdays_only,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+            'last_run': self.last_run.isoformat() if self.last_run else None,
+            'last_error': self.last_error,
+            'runs': self.runs,
+        }
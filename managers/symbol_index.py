@@ -0,0 +1,51 @@
+import threading
+import time
+
+
+class SymbolIndex:
+    """
+    In-memory set of known ticker symbols.
+
+    Loaded from `loader` (DatabaseManager.get_all_tickers) on first use and
+    reloaded once it is older than `refresh_interval` seconds, so membership
+    checks are set lookups instead of one database query per symbol.
+    Symbols validated remotely can be added with add() and survive until the
+    next reload only if the loader also returns them.
+    """
+
+    def __init__(self, loader, refresh_interval: float = 3600, clock=time.time):
+        """
+        loader: callable returning an iterable of symbols
+        refresh_interval: seconds before the index is reloaded
+        clock: time source in seconds (injectable for tests)
+        """
+        self.loader = loader
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.symbols = frozenset()
+        self.loaded_at = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False):
+        """Reload from the loader if never loaded, stale, or `force`."""
+        with self._lock:
+            if not force and self.loaded_at is not None and self.clock() - self.loaded_at < self.refresh_interval:
+                return
+            try:
+                self.symbols = frozenset(str(symbol).upper() for symbol in self.loader())
+            finally:
+                # A failing loader is not retried until the next interval
+                self.loaded_at = self.clock()
+
+    def __contains__(self, symbol) -> bool:
+        self.refresh()
+        return str(symbol).upper() in self.symbols
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self.symbols)
+
+    def add(self, symbols):
+        """Mark `symbols` as known (e.g. after remote validation)."""
+        with self._lock:
+            self.symbols = self.symbols | {str(symbol).upper() for symbol in symbols}
@@ -0,0 +1,141 @@
+import os
+import pickle
+import threading
+import time
+import warnings
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Bounded cache for slow-changing per-ticker data (earnings history, ticker info).
+
+    Entries are keyed by (field, ticker) and expire after the TTL configured
+    for their field. They are kept in a memory LRU of at most `max_entries`
+    and, when `cache_dir` is set, pickled one file per entry so they survive
+    restarts; the oldest files are pruned once the directory holds more than
+    `max_entries` of them.
+    """
+
+    DEFAULT_TTLS = {
+        'earnings_history': 7 * 24 * 3600,
+        'info': 24 * 3600,
+    }
+    DEFAULT_TTL = 24 * 3600
+
+    def __init__(self, cache_dir: str = None, max_entries: int = 1024, ttls: dict = None, clock=time.time):
+        """
+        cache_dir: directory for pickled entries (None = memory only)
+        max_entries: entries kept in memory, and on disk
+        ttls: {field: seconds} overriding DEFAULT_TTLS
+        clock: time source in seconds (injectable for tests)
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, field: str, ticker: str) -> str:
+        return os.path.join(self.cache_dir, f"{field}__{ticker}.pkl")
+
+    def ttl(self, field: str) -> float:
+        return self.ttls.get(field, self.DEFAULT_TTL)
+
+    def _fresh(self, field: str, stored_at: float) -> bool:
+        return self.clock() - stored_at < self.ttl(field)
+
+    def get(self, field: str, ticker: str, default=None):
+        """Cached value for (field, ticker) if it has not expired, else `default` (a miss)."""
+        key = (field, ticker)
+        with self._lock:
+            if key in self.entries:
+                stored_at, value = self.entries[key]
+                if self._fresh(field, stored_at):
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+
+            if self.cache_dir and os.path.exists(self._path(field, ticker)):
+                try:
+                    with open(self._path(field, ticker), 'rb') as f:
+                        stored_at, value = pickle.load(f)
+                    if self._fresh(field, stored_at):
+                        self._remember(key, stored_at, value)
+                        self.hits += 1
+                        return value
+                except Exception as e:
+                    warnings.warn(f"Failed to load cached {field} for {ticker}: {e}")
+
+            self.misses += 1
+            return default
+
+    def put(self, field: str, ticker: str, value):
+        """Store `value` for (field, ticker), stamped with the current time."""
+        stored_at = self.clock()
+        with self._lock:
+            self._remember((field, ticker), stored_at, value)
+
+            if self.cache_dir:
+                try:
+                    tmp_path = self._path(field, ticker) + '.tmp'
+                    with open(tmp_path, 'wb') as f:
+                        pickle.dump((stored_at, value), f)
+                    os.replace(tmp_path, self._path(field, ticker))
+                    self._prune_disk()
+                except Exception as e:
+                    warnings.warn(f"Failed to save {field} for {ticker}: {e}")
+
+    def get_or_fetch(self, field: str, ticker: str, fetch):
+        """
+        Cached value for (field, ticker), calling `fetch()` and caching its
+        result on a miss. Exceptions from `fetch` propagate and nothing is cached.
+        """
+        missing = object()
+        value = self.get(field, ticker, missing)
+        if value is missing:
+            value = fetch()
+            self.put(field, ticker, value)
+        return value
+
+    def _remember(self, key, stored_at: float, value):
+        self.entries[key] = (stored_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _prune_disk(self):
+        names = [name for name in os.listdir(self.cache_dir) if name.endswith('.pkl')]
+        if len(names) <= self.max_entries:
+            return
+        paths = sorted((os.path.join(self.cache_dir, name) for name in names), key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_entries]:
+            os.remove(path)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for reporting."""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'in_memory': len(self.entries),
+        }
+
+    def clear(self):
+        """Drop all entries (memory and disk) and reset counters."""
+        with self._lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            if self.cache_dir and os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith('.pkl'):
+                        os.remove(os.path.join(self.cache_dir, name))
@@ -207,16 +207,44 @@ Future<Map<String, dynamic>> adminUpdateUser(
   }
 
   //update estimations
+  //starts a background refresh and waits for it to finish
   Future<Map<String, dynamic>> updateEstimations() async {
     final response = await http.post(
       Uri.parse('$baseUrl/estimations/update'),
       headers: {'Content-Type': 'application/json'},
     );
 
+    if (response.statusCode != 200 && response.statusCode != 202) {
+      throw Exception('Failed to update estimations: ${response.body}');
+    }
+
+    final started = Map<String, dynamic>.from(jsonDecode(response.body));
+    final jobId = started['job_id'];
+    if (jobId == null) {
+      return started;
+    }
+
+    //poll the job until the server is done refreshing
+    while (true) {
+      await Future.delayed(const Duration(seconds: 2));
+      final job = await getJob(jobId);
+      if (job['status'] == 'succeeded') {
+        return job;
+      }
+      if (job['status'] == 'failed') {
+        throw Exception('Failed to update estimations: ${job['error']}');
+      }
+    }
+  }
+
+  //status and per-ticker progress of a refresh job
+  Future<Map<String, dynamic>> getJob(String jobId) async {
+    final response = await http.get(Uri.parse('$baseUrl/jobs/$jobId'));
+
     if (response.statusCode == 200) {
       return Map<String, dynamic>.from(jsonDecode(response.body));
     } else {
-      throw Exception('Failed to update estimations: ${response.body}');
+      throw Exception('Failed to get job status: ${response.body}');
     }
   }
 